@@ -1,14 +1,18 @@
 import re
 import numpy as np
-from copy import deepcopy
+from dataclasses import replace
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
 from logging import Logger
-from typing import List, Dict, Set
+from typing import List, Dict
 from rapidfuzz import process, fuzz
+from pydantic import ValidationError
 from langchain_core.exceptions import OutputParserException
 from source.jurisdiction import Jurisdiction
 from source.task_id import TaskID
 from source.case import Case
 from source.solver import Solver
+from source.statute import Exemption
 from source.statute_set import StatuteSet
 from source.pydantic_response import (
     Claim,
@@ -19,17 +23,36 @@ from source.pydantic_response import (
     )
 
 
+# Evaluator instance used by worker processes, set once per worker by _init_worker_evaluator
+_worker_evaluator = None
+
+def _init_worker_evaluator(evaluator: 'Evaluator'):
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+def _score_sample_in_worker(method_name: str, *sample):
+    return getattr(_worker_evaluator, method_name)(*sample)
+
+
 # The Evaluator class is responsible for evaluating model predictions on OpenExempt tasks.
 # Note: evaluating solutions requires the statutes and cases used to generate the dataset.
+# Samples are scored independently, so max_workers > 1 scores them across worker processes.
 class Evaluator:
-    def __init__(self, statute_sets: List[StatuteSet]):
+    def __init__(self, statute_sets: List[StatuteSet], max_workers: int = 1):
+        self.max_workers = max_workers
         self.statute_set_map = {statute_set.jurisdiction: statute_set for statute_set in statute_sets}
         self.solver = self._init_solver(statute_sets)
-        self.citation_map = {statute_set.jurisdiction: statute_set.exemption_citations() for statute_set in statute_sets}
+        # Citations are stored as frozensets for constant time membership checks
+        self.citation_map = {statute_set.jurisdiction: frozenset(statute_set.exemption_citations()) for statute_set in statute_sets}
         self.normalized_citation_map = {
-            jurisdiction: [citation.strip().lower() for citation in citations]
+            jurisdiction: frozenset(citation.strip().lower() for citation in citations)
             for jurisdiction, citations in self.citation_map.items()
         }
+        # Reverse indices from citation to jurisdiction (if a citation appears in several jurisdictions, the first one wins)
+        self._citation_to_jurisdiction = self._reverse_citation_index(self.citation_map)
+        self._normalized_citation_to_jurisdiction = self._reverse_citation_index(self.normalized_citation_map)
+        # Lookup from raw to normalized citation, so case asset citations are not re-normalized per sample
+        self._normalized_citation_lookup = {citation: citation.strip().lower() for citation in self._citation_to_jurisdiction}
         self.logger = None # Set to dataset logger at time of evaluation
 
     # This is the only method needed for evaluation - all evaluation logic is handled by evaluator.
@@ -55,8 +78,16 @@ class Evaluator:
             case _:
                 raise NotImplementedError(f'Evaluation not implemented for task ID: {task_id}')
             
+    # Apply evaluator method to each sample, in worker processes if max_workers > 1 (results keep sample order)
+    def _map_samples(self, method_name: str, *sample_lists: List):
+        if self.max_workers <= 1:
+            return list(map(getattr(self, method_name), *sample_lists))
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker_evaluator, initargs=(self,)) as executor:
+            return list(executor.map(_score_sample_in_worker, repeat(method_name), *sample_lists, chunksize=32))
+            
     def _parse_predictions(self, predictions: List[Dict[str, str]], task_id: TaskID):
         parser = task_id.response_parser()
+        response_class = task_id.response_class()
         parsed_predictions = []
         for prediction_dict in predictions:
             parsed_prediction = prediction_dict['prediction']
@@ -64,6 +95,13 @@ class Evaluator:
             if not parser: # No parsing needed
                 parsed_predictions.append(parsed_prediction)
                 continue
+            # Fast path: validate plain JSON responses directly with pydantic
+            # Responses which are not plain JSON (e.g. wrapped in markdown) fall back to the output parser
+            try:
+                parsed_predictions.append(response_class.model_validate_json(parsed_prediction.strip()))
+                continue
+            except ValidationError:
+                pass
             try:
                 parsed_prediction = parser.parse(parsed_prediction)
             except OutputParserException as parser_exception: # Invalid response format
@@ -83,17 +121,23 @@ class Evaluator:
             return prediction
         return prediction[index + len(separator):].strip()
     
+    # Solver uses normalized exemption citations. Only exemptions are copied (with normalized citations),
+    # all other statutes are shared with the original statute sets.
     def _init_solver(self, statute_sets: List[StatuteSet]):
-        normalized_statute_sets = deepcopy(statute_sets)
-        for statute_set in normalized_statute_sets:
-            for exemption in statute_set.exemptions():
-                exemption.citation = exemption.citation.strip().lower()
-                if exemption.fallback_relationship:
-                    exemption.fallback_relationship = exemption.fallback_relationship.strip().lower()
-                if exemption.mutual_exclusion:
-                    exemption.mutual_exclusion = exemption.mutual_exclusion.strip().lower()
+        normalized_statute_sets = []
+        for statute_set in statute_sets:
+            statutes = [self._normalize_exemption(statute) if isinstance(statute, Exemption) else statute for statute in statute_set.statutes]
+            normalized_statute_sets.append(StatuteSet(statute_set.jurisdiction, statute_set.authority, statute_set.has_opted_out, statutes))
         return Solver({statute_set.jurisdiction: statute_set for statute_set in normalized_statute_sets})
     
+    def _normalize_exemption(self, exemption: Exemption):
+        fallback_relationship = exemption.fallback_relationship
+        mutual_exclusion = exemption.mutual_exclusion
+        return replace(exemption,
+                       citation=exemption.citation.strip().lower(),
+                       fallback_relationship=fallback_relationship.strip().lower() if fallback_relationship else fallback_relationship,
+                       mutual_exclusion=mutual_exclusion.strip().lower() if mutual_exclusion else mutual_exclusion)
+    
     # Parse comma-separated multi-label string into a set of labels
     def _parse_multi_label_string(self, label_string: str):
         labels = [label.strip() for label in label_string.split(',')]
@@ -105,21 +149,23 @@ class Evaluator:
         f1 = 2 * (precision * recall) / (precision + recall) if precision + recall > 0 else 0
         return precision, recall, f1
     
-    def _compute_precision_recall_f1_scores(self, prediction: Set[str], target: Set[str]):
-        normalized_prediction = set(label.strip().lower() for label in prediction)
-        normalized_target = set(label.strip().lower() for label in target)
-        tp = len(normalized_prediction & normalized_target)
-        fp = len(normalized_prediction - normalized_target)
-        fn = len(normalized_target - normalized_prediction)
-        return self._precision_recall_f1_from_outcomes(tp, fp, fn)
-        
+    # Vectorized variant of _precision_recall_f1_from_outcomes over arrays of outcome counts
+    # Scores are written into the columns of one zeroed (n x 3) buffer, rather than allocating an output per score and stacking them
+    def _precision_recall_f1_score_array(self, tp: np.ndarray, fp: np.ndarray, fn: np.ndarray):
+        score_array = np.zeros((len(tp), 3)) # 3 columns for precision, recall, f1
+        precision, recall, f1 = score_array.T
+        np.divide(tp, tp + fp, out=precision, where=(tp + fp) > 0)
+        np.divide(tp, tp + fn, out=recall, where=(tp + fn) > 0)
+        np.divide(2 * (precision * recall), precision + recall, out=f1, where=(precision + recall) > 0)
+        return score_array
+    
     def _compute_precision_recall_f1_mare_scores(self, prediction: List[Claim], target: List[Claim]):
         # Calculate true positives, false positives, false negatives and relative errors
         tp, fp, fn = 0, 0, 0
         relative_errors = []
         target_map = {claim.normalized_citation: claim for claim in target}
         for predicted_claim in prediction:
-            matching_claim, relative_error = self._find_matching_claim(predicted_claim, list(target_map.values()))
+            matching_claim, relative_error = self._find_matching_claim(predicted_claim, target_map)
             if relative_error is not None: # Record relative error for all matching claims
                 relative_errors.append(relative_error)
             if matching_claim and relative_error < 0.05:
@@ -133,21 +179,30 @@ class Evaluator:
         mare = np.mean(relative_errors) if relative_errors else np.nan
         return precision, recall, f1, mare
     
-    def _find_matching_asset_description(self, asset_description: str, candidates: List[str]):
+    # Match each asset description to a candidate asset description (None if no match is found)
+    # Exact matches are resolved by set lookup, only the remaining descriptions are fuzzy scored in a single batched rapidfuzz call
+    def _match_asset_descriptions(self, asset_descriptions: List[str], candidates: List[str]):
         if not candidates:
-            return None
-        # If exact match exists, return asset description
-        if asset_description in candidates:
-            return asset_description
-        # Use rapidfuzz to check for near identical asset description
+            return [None] * len(asset_descriptions)
+        candidate_set = set(candidates)
+        matches = [asset_description if asset_description in candidate_set else None for asset_description in asset_descriptions]
+        residual_indices = [index for index, match in enumerate(matches) if match is None]
+        if not residual_indices: # Every asset description has an exact match
+            return matches
+        # Descriptions are already normalized, so rapidfuzz preprocessing is disabled
         score_threshold = 90
-        best_match, score, index = process.extractOne(asset_description, candidates, scorer=fuzz.partial_ratio)
-        return best_match if score > score_threshold else None
+        residual_descriptions = [asset_descriptions[index] for index in residual_indices]
+        scores = process.cdist(residual_descriptions, candidates, scorer=fuzz.partial_ratio, processor=None, dtype=np.float64)
+        best_indices = scores.argmax(axis=1)
+        for row, (query_index, best_index) in enumerate(zip(residual_indices, best_indices)):
+            if scores[row, best_index] > score_threshold: # Near identical asset description
+                matches[query_index] = candidates[best_index]
+        return matches
     
-    def _find_matching_claim(self, prediction: Claim, targets: List[Claim]):
-        for target in targets:
-            if prediction.normalized_citation == target.normalized_citation:
-                return target, self._absolute_relative_error(prediction.claim_value, target.claim_value)
+    def _find_matching_claim(self, prediction: Claim, target_map: Dict[str, Claim]):
+        target = target_map.get(prediction.normalized_citation)
+        if target:
+            return target, self._absolute_relative_error(prediction.claim_value, target.claim_value)
         return None, None
     
     # Compute absolute relative error with an epsilon constant to avoid division by zero
@@ -158,61 +213,113 @@ class Evaluator:
             return 0.0
         return abs((prediction / (target + epsilon)) - 1.0)
     
+    # Vectorized variant of _absolute_relative_error (NaN inputs propagate to NaN errors)
+    def _absolute_relative_errors(self, predictions: np.ndarray, targets: np.ndarray, epsilon: float = 1):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            relative_errors = np.abs((predictions / (targets + epsilon)) - 1.0)
+        return np.where(predictions == targets, 0.0, relative_errors)
+    
+    @staticmethod
+    def _reverse_citation_index(citation_map: Dict[Jurisdiction, frozenset]):
+        citation_index = {}
+        for jurisdiction, citations in citation_map.items():
+            for citation in citations:
+                citation_index.setdefault(citation, jurisdiction)
+        return citation_index
+    
     def _detect_jurisdiction(self, claim_map: Dict[str, List[Claim]], normalized: bool = False):
         # Jurisdiction is determined by first valid exemption citation
-        citation_map = self.normalized_citation_map if normalized else self.citation_map
+        citation_index = self._normalized_citation_to_jurisdiction if normalized else self._citation_to_jurisdiction
         for claims in claim_map.values():
             for claim in claims:
-                for jurisdiction, citations in citation_map.items():
-                    citation = claim.normalized_citation if normalized else claim.citation
-                    if citation in citations:
-                        return jurisdiction
+                jurisdiction = citation_index.get(claim.normalized_citation if normalized else claim.citation)
+                if jurisdiction is not None:
+                    return jurisdiction
         return None # No valid exemption citations
     
+    def _normalize_case_citation(self, citation: str):
+        normalized_citation = self._normalized_citation_lookup.get(citation)
+        return normalized_citation if normalized_citation is not None else citation.strip().lower()
+    
+    # Map case asset descriptions to their applicable exemptions in the given jurisdiction, and to their dollar values
+    # Only dollar values are modified during evaluation, so exemptions are returned as frozensets in a separate map
     def _case_asset_map_for_jurisdiction(self, case: Case, jurisdiction: Jurisdiction, normalized: bool = False):
-        asset_map = {}
+        exemption_map = {}
+        remaining_values = {}
         citation_map = self.normalized_citation_map if normalized else self.citation_map
         jurisdiction_citations = citation_map[jurisdiction]
-        for asset in deepcopy(case.assets):
-            description = asset.description.strip().lower() if normalized else asset.description
-            asset.description = description
+        for case_asset in case.assets:
+            description = case_asset.description.strip().lower() if normalized else case_asset.description
+            applicable_exemptions = case_asset.applicable_exemptions
             if normalized:
-                asset.applicable_exemptions = [citation.strip().lower() for citation in asset.applicable_exemptions]
-            asset.applicable_exemptions = [citation for citation in asset.applicable_exemptions if citation in jurisdiction_citations]
-            asset_map[description] = asset
-        return asset_map
+                applicable_exemptions = [self._normalize_case_citation(citation) for citation in applicable_exemptions]
+            exemption_map[description] = frozenset(citation for citation in applicable_exemptions if citation in jurisdiction_citations)
+            remaining_values[description] = case_asset.dollar_value
+        return exemption_map, remaining_values
         
     # Evaluate TaskID.ALLOWABLE_EXEMPTIONS
     def _evaluate_allowable_exemptions(self, predictions: List[str], targets: List[str]):
-        prediction_sets = [self._parse_multi_label_string(prediction) for prediction in predictions]
-        target_sets = [self._parse_multi_label_string(target) for target in targets]
-        score_array = np.array([self._compute_precision_recall_f1_scores(prediction_set, target_set) for prediction_set, target_set in zip(prediction_sets, target_sets)])
+        prediction_sets = [{label.lower() for label in self._parse_multi_label_string(prediction)} for prediction in predictions]
+        target_sets = [{label.lower() for label in self._parse_multi_label_string(target)} for target in targets]
+        # Encode label sets as boolean matrices (samples x labels), so outcomes are counted for all samples at once
+        label_index = {}
+        for label_set in prediction_sets + target_sets:
+            for label in label_set:
+                label_index.setdefault(label, len(label_index))
+        prediction_matrix = np.zeros((len(prediction_sets), len(label_index)), dtype=bool)
+        target_matrix = np.zeros((len(target_sets), len(label_index)), dtype=bool)
+        for sample_index, (prediction_set, target_set) in enumerate(zip(prediction_sets, target_sets)):
+            prediction_matrix[sample_index, [label_index[label] for label in prediction_set]] = True
+            target_matrix[sample_index, [label_index[label] for label in target_set]] = True
+        tp = (prediction_matrix & target_matrix).sum(axis=1)
+        fp = (prediction_matrix & ~target_matrix).sum(axis=1)
+        fn = (~prediction_matrix & target_matrix).sum(axis=1)
+        score_array = self._precision_recall_f1_score_array(tp, fp, fn)
         scores = score_array.mean(axis=0)
         precision, recall, f1 = scores
         return {'precision': float(precision), 'recall': float(recall), 'f1': float(f1)}
     
     # Evaluate TaskID.EXEMPTION_CLASSIFICATION
     def _evaluate_exemption_classification(self, predictions: List[ExemptionClassificationResponse], targets: List[Dict]):
-        score_array = np.zeros((len(targets), 3)) # 3 columns for precision, recall, f1
         invalid_format_count = 0
-        for sample_index, (prediction, target) in enumerate(zip(predictions, targets)):
+        normalized_targets = [{key.strip().lower(): value for key, value in target.items()} for target in targets]
+        # Per-asset outcomes for all samples are stored in one flat array, each sample's assets in a contiguous segment
+        # Invalid response formats have no asset segment
+        asset_counts = np.array([
+            len(normalized_target) if prediction is not None else 0
+            for prediction, normalized_target in zip(predictions, normalized_targets)
+        ], dtype=np.int64)
+        sample_offsets = np.cumsum(asset_counts) - asset_counts
+        outcome_array = np.zeros((asset_counts.sum(), 3), dtype=np.int32) # 3 columns for tp, fp, fn
+        for sample_index, (prediction, normalized_target) in enumerate(zip(predictions, normalized_targets)):
             if prediction is None: # Invalid response format
-                score_array[sample_index, :] = 0
                 invalid_format_count += 1
                 continue
             normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
-            normalized_target = {key.strip().lower(): value for key, value in target.items()}
-            asset_score_array = np.zeros((len(normalized_target), 3))
-            for asset_index, (asset_description, citations) in enumerate(normalized_target.items()):
-                matching_asset_description = self._find_matching_asset_description(asset_description, list(normalized_prediction.keys()))
+            offset = sample_offsets[sample_index]
+            # Unmatched assets keep zero outcomes, which score zero precision, recall and f1
+            matching_asset_descriptions = self._match_asset_descriptions(list(normalized_target.keys()), list(normalized_prediction.keys()))
+            for asset_index, (citations, matching_asset_description) in enumerate(zip(normalized_target.values(), matching_asset_descriptions)):
                 if matching_asset_description is None:
-                    asset_score_array[asset_index, :] = 0
                     continue
-                predicted_citations = normalized_prediction[matching_asset_description]
-                predicted_citations = [Claim.normalize_citation(citation) for citation in predicted_citations]
-                precision, recall, f1 = self._compute_precision_recall_f1_scores(set(predicted_citations), set(citations))
-                asset_score_array[asset_index] = [precision, recall, f1]
-            score_array[sample_index, :] = asset_score_array.mean(axis=0) # Sample-based scores
+                predicted_citations = {Claim.normalize_citation(citation) for citation in normalized_prediction[matching_asset_description]}
+                target_citations = {citation.strip().lower() for citation in citations}
+                outcome_array[offset + asset_index] = (
+                    len(predicted_citations & target_citations),
+                    len(predicted_citations - target_citations),
+                    len(target_citations - predicted_citations)
+                )
+        # Score all assets at once, then average asset scores within each sample (sample-based scores)
+        asset_score_array = self._precision_recall_f1_score_array(*outcome_array.T)
+        score_array = np.zeros((len(targets), 3)) # 3 columns for precision, recall, f1 (invalid response formats score 0)
+        scored_samples = asset_counts > 0
+        if scored_samples.any():
+            # reduceat sums each segment up to the next offset, so empty segments are excluded from the offsets
+            asset_score_sums = np.add.reduceat(asset_score_array, sample_offsets[scored_samples], axis=0)
+            score_array[scored_samples] = asset_score_sums / asset_counts[scored_samples, np.newaxis]
+        # Valid responses for samples without target assets have undefined (NaN) scores
+        valid_samples = np.array([prediction is not None for prediction in predictions], dtype=bool)
+        score_array[valid_samples & ~scored_samples] = np.nan
         # Compute precision, recall and f1 scores across all samples
         precision, recall, f1 = score_array.mean(axis=0)
         return {'precision': float(precision), 
@@ -223,27 +330,10 @@ class Evaluator:
     # Evaluate TaskID.EXEMPTION_VALUATION
     def _evaluate_exemption_valuation(self, predictions: List[ExemptionValuationResponse], targets: List[Dict]):
         score_array = np.zeros((len(targets), 4)) # 4 columns for precision, recall, f1, mare
-        invalid_format_count = 0
-        for sample_index, (prediction, target) in enumerate(zip(predictions, targets)):
-            if prediction is None: # Invalid response format
-                score_array[sample_index] = [0, 0, 0, np.nan]
-                invalid_format_count += 1
-                continue
-            normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
-            normalized_target = {
-                asset_description.strip().lower(): [Claim(**claim_dict) for claim_dict in claim_dicts]
-                for asset_description, claim_dicts in target.items()
-            }
-            asset_score_array = np.zeros((len(normalized_target), 4))
-            for asset_index, (asset_description, claims) in enumerate(normalized_target.items()):
-                matching_asset_description = self._find_matching_asset_description(asset_description, list(normalized_prediction.keys()))
-                if matching_asset_description is None:
-                    asset_score_array[asset_index] = [0, 0, 0, np.nan]
-                    continue
-                predicted_claims = normalized_prediction[matching_asset_description]
-                precision, recall, f1, mare = self._compute_precision_recall_f1_mare_scores(predicted_claims, claims)
-                asset_score_array[asset_index] = [precision, recall, f1, mare]
-            score_array[sample_index, :] = np.nanmean(asset_score_array, axis=0) # Sample-based scores
+        invalid_format_count = sum(prediction is None for prediction in predictions)
+        sample_scores = self._map_samples('_score_exemption_valuation_sample', predictions, targets)
+        for sample_index, scores in enumerate(sample_scores):
+            score_array[sample_index] = scores
         # Compute precision, recall, f1 and MARE scores across all samples
         precision, recall, f1, mare = np.nanmean(score_array, axis=0)
         mare = None if np.isnan(mare) else float(mare)
@@ -253,35 +343,69 @@ class Evaluator:
                 'mare': mare,
                 'invalid_format': invalid_format_count}
     
+    # Score a single TaskID.EXEMPTION_VALUATION sample (precision, recall, f1, mare)
+    def _score_exemption_valuation_sample(self, prediction: ExemptionValuationResponse, target: Dict):
+        if prediction is None: # Invalid response format
+            return [0, 0, 0, np.nan]
+        normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
+        normalized_target = {
+            asset_description.strip().lower(): [Claim(**claim_dict) for claim_dict in claim_dicts]
+            for asset_description, claim_dicts in target.items()
+        }
+        # Sample-based scores are accumulated as running sums (unmatched assets score 0 and have no MARE)
+        precision_sum, recall_sum, f1_sum, mare_sum, mare_count = 0.0, 0.0, 0.0, 0.0, 0
+        matching_asset_descriptions = self._match_asset_descriptions(list(normalized_target.keys()), list(normalized_prediction.keys()))
+        for claims, matching_asset_description in zip(normalized_target.values(), matching_asset_descriptions):
+            if matching_asset_description is None:
+                continue
+            predicted_claims = normalized_prediction[matching_asset_description]
+            precision, recall, f1, mare = self._compute_precision_recall_f1_mare_scores(predicted_claims, claims)
+            precision_sum += precision
+            recall_sum += recall
+            f1_sum += f1
+            if not np.isnan(mare):
+                mare_sum += mare
+                mare_count += 1
+        asset_count = len(normalized_target)
+        if asset_count == 0: # No target assets, scores are undefined
+            return [np.nan, np.nan, np.nan, np.nan]
+        return [precision_sum / asset_count, recall_sum / asset_count, f1_sum / asset_count, mare_sum / mare_count if mare_count > 0 else np.nan]
+    
     # Evaluate TaskID.NONEXEMPT_ASSETS
     def _evaluate_nonexempt_assets(self, predictions: List[NonExemptAssetsResponse], targets: List[Dict]):
-        score_array = np.zeros((len(targets), 4)) # 4 columns for precision, recall, f1, mare
         invalid_format_count = 0
+        valid_samples = np.ones(len(targets), dtype=bool)
+        target_counts = np.zeros(len(targets), dtype=np.int64)
+        # Flatten predicted values for all samples, aligned with the target value for the same jurisdiction (NaN if not in target)
+        sample_indices, predicted_values, target_values = [], [], []
         for sample_index, (prediction, target) in enumerate(zip(predictions, targets)):
             if prediction is None: # Invalid response format
-                score_array[sample_index] = [0, 0, 0, np.nan]
+                valid_samples[sample_index] = False
                 invalid_format_count += 1
                 continue
             normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
             normalized_target = {key.strip().lower(): value for key, value in target.items()}
-            tp, fp, fn = 0, 0, 0
-            relative_errors = []
+            target_counts[sample_index] = len(normalized_target)
             for jurisdiction, predicted_dollar_value in normalized_prediction.items():
-                if jurisdiction not in normalized_target:
-                    relative_errors.append(np.nan)
-                    fp += 1
-                else:
-                    dollar_value = normalized_target[jurisdiction]
-                    relative_error = self._absolute_relative_error(predicted_dollar_value, dollar_value)
-                    relative_errors.append(relative_error)
-                    if relative_error < 0.05:
-                        normalized_target.pop(jurisdiction)
-                        tp += 1
-                    else:
-                        fp += 1
-            fn = len(normalized_target)
-            precision, recall, f1 = self._precision_recall_f1_from_outcomes(tp, fp, fn)
-            score_array[sample_index] = [precision, recall, f1, np.nanmean(relative_errors)]
+                sample_indices.append(sample_index)
+                predicted_values.append(predicted_dollar_value)
+                target_values.append(normalized_target.get(jurisdiction, np.nan))
+        sample_indices = np.array(sample_indices, dtype=np.int64)
+        relative_errors = self._absolute_relative_errors(np.array(predicted_values, dtype=np.float64), np.array(target_values, dtype=np.float64))
+        # Predictions within tolerance of the target are true positives, all other predictions are false positives
+        # Prediction keys are unique per sample, so each target jurisdiction is matched at most once
+        has_error = ~np.isnan(relative_errors)
+        within_tolerance = has_error & (relative_errors < 0.05)
+        tp = np.bincount(sample_indices[within_tolerance], minlength=len(targets))
+        fp = np.bincount(sample_indices, minlength=len(targets)) - tp
+        fn = target_counts - tp
+        precision, recall, f1 = self._precision_recall_f1_score_array(tp, fp, fn).T
+        # Mean relative error per sample, ignoring unmatched jurisdictions (NaN if no jurisdiction is matched)
+        error_sums = np.bincount(sample_indices[has_error], weights=relative_errors[has_error], minlength=len(targets))
+        error_counts = np.bincount(sample_indices[has_error], minlength=len(targets))
+        mare = np.divide(error_sums, error_counts, out=np.full(len(targets), np.nan), where=error_counts > 0)
+        score_array = np.column_stack((precision, recall, f1, mare)) # 4 columns for precision, recall, f1, mare
+        score_array[~valid_samples] = [0, 0, 0, np.nan]
         # Compute precision, recall, f1 and MARE scores across all samples
         precision, recall, f1, mare = np.nanmean(score_array, axis=0)
         mare = None if np.isnan(mare) else float(mare)
@@ -294,123 +418,13 @@ class Evaluator:
     # Evaluate TaskID.OPTIMAL_EXEMPTIONS
     def _evaluate_optimal_exemptions(self, predictions: List[OptimalExemptionsResponse], targets: List[Dict], cases: List[Case]):
         error_array = np.zeros((len(targets), 2)) # 2 columns for relative error, invalid claim ratio
-        invalid_format_count = 0
-        tp, fp, fn = 0, 0, 0
-        for sample_index, (prediction, target, case) in enumerate(zip(predictions, targets, cases)):
-            if prediction is None: # Invalid response format
-                error_array[sample_index] = [np.nan, 1]
-                invalid_format_count += 1
-                fn += 1
-                continue
-            elif (not prediction.root) and (not target): # Edge case: optimal solution contains no claims
-                error_array[sample_index] = [0, 0]
-                tp += 1
-                continue
-            elif not target: # Optimal solution contains no claims, but prediction does
-                error_array[sample_index] = [np.nan, 1]
-                fn += 1
-                continue
-            # Validate predicted solution
-            normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
-            predicted_jurisdiction = self._detect_jurisdiction(normalized_prediction, normalized=True)
-            allowable_jurisdictions = self.statute_set_map[case.state_jurisdiction].allowable_exemption_jurisdictions()
-            if predicted_jurisdiction is None or predicted_jurisdiction not in allowable_jurisdictions:
-                error_array[sample_index] = [np.nan, 1]
-                fn += 1
-                continue
-            # Initialize predicted solution and validate claims
-            invalid_claim_count = 0
-            total_claim_count = 0
-            predicted_solution = self.solver.init_solution(case, predicted_jurisdiction)
-            case_asset_map = self._case_asset_map_for_jurisdiction(case, predicted_jurisdiction, normalized=True)
-            for asset_description, claims in normalized_prediction.items():
-                total_claim_count += len(claims)
-                matching_asset_description = self._find_matching_asset_description(asset_description, list(case_asset_map.keys()))
-                if matching_asset_description is None:
-                    invalid_claim_count += len(claims)
-                    continue
-                case_asset = case_asset_map[matching_asset_description]
-                deduped_claim_map = {}
-                for claim in claims:
-                    if claim.normalized_citation not in deduped_claim_map:
-                        deduped_claim_map[claim.normalized_citation] = 0
-                    deduped_claim_map[claim.normalized_citation] += claim.claim_value
-                deduped_claims = [Claim(citation=citation, claim_value=value) for citation, value in deduped_claim_map.items()]
-                for claim in deduped_claims:
-                    if (claim.normalized_citation not in case_asset.applicable_exemptions or 
-                        claim.claim_value > case_asset.dollar_value):
-                        invalid_claim_count += 1
-                    else:
-                        # Create checkpoint so we may revert if claim is invalid.
-                        solution_checkpoint = deepcopy(predicted_solution)
-                        allocated_amount = predicted_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value)
-                        # If remaining claim value, check for additional item claims
-                        while ((claim.claim_value - allocated_amount) > 0 and 
-                               predicted_solution.item_claim_exists(claim.normalized_citation)):
-                            allocated_amount += predicted_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value - allocated_amount)
-                        # Over-allocated claims are treated as invalid.
-                        # Over-allocation occurs whenever claim value exceeds the maximum value allowed by law (allocated amount).
-                        if claim.claim_value > allocated_amount:
-                            invalid_claim_count += 1
-                            predicted_solution = solution_checkpoint
-                        elif allocated_amount > 0:
-                            case_asset.dollar_value -= allocated_amount
-                            predicted_solution.claim_exemption(claim.normalized_citation, case_asset.description, allocated_amount)
-            # All claims have been processed, any remaining dollar value is non-exempt
-            for case_asset in case_asset_map.values():
-                if case_asset.dollar_value > 0:
-                    predicted_solution.non_exempt_assets[case_asset.description] = case_asset.dollar_value
-            # Compute invalid claim ratio
-            invalid_claim_ratio = invalid_claim_count / total_claim_count if total_claim_count > 0 else 0
-            # Perform sanity checks on optimal solution
-            # These checks will always pass if the same statutes and cases used to generate dataset are used for evaluation.
-            normalized_target = {
-                asset_description: [Claim(**claim_dict) for claim_dict in claim_dicts]
-                for asset_description, claim_dicts in target.items()
-            }
-            optimal_jurisdiction = self._detect_jurisdiction(normalized_target)
-            assert optimal_jurisdiction in allowable_jurisdictions, (
-                f'Unexpected error: jurisdiction for target solution ({optimal_jurisdiction}) is not an allowable jurisdiction: {allowable_jurisdictions}'
-            )
-            # Initialize optimal solution and process claims (with sanity checks)
-            optimal_solution = self.solver.init_solution(case, optimal_jurisdiction)
-            case_asset_map = self._case_asset_map_for_jurisdiction(case, optimal_jurisdiction)
-            for asset_description, claims in normalized_target.items():
-                assert asset_description in case_asset_map, (
-                    f'Unexpected error: target solution contains asset description ({asset_description}) not found in case assets: {list(case_asset_map.keys())}'
-                )
-                case_asset = case_asset_map[asset_description]
-                for claim in claims:
-                    assert claim.citation in case_asset.applicable_exemptions, (
-                        f'Unexpected error: exemption citation in target solution ({claim.citation}) is not an allowable exemption: {case_asset.applicable_exemptions}'
-                    )
-                    allocated_amount = optimal_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value)
-                    # If remaining claim value, check for additional item claims
-                    while ((claim.claim_value - allocated_amount) > 0 and 
-                            optimal_solution.item_claim_exists(claim.normalized_citation)):
-                        allocated_amount += optimal_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value - allocated_amount)
-                    
-                    assert allocated_amount == claim.claim_value, (
-                        f'Unexpected error: claim in target solution ({claim}) is over-allocated (allocated amount: {allocated_amount})'
-                    )
-                    case_asset.dollar_value -= allocated_amount
-                    optimal_solution.claim_exemption(claim.normalized_citation, case_asset.description, allocated_amount)
-            # All claims have been processed, any remaining dollar value is non-exempt
-            for case_asset in case_asset_map.values():
-                if case_asset.dollar_value > 0:
-                    optimal_solution.non_exempt_assets[case_asset.description] = case_asset.dollar_value
-            # Compare predicted and optimal solutions
-            predicted_non_exempt_total = predicted_solution.total_non_exempt_value()
-            optimal_non_exempt_total = optimal_solution.total_non_exempt_value()
-            assert optimal_non_exempt_total <= predicted_non_exempt_total, (
-                f'Unexpected error: encountered predicted solution which outperforms optimal solution (predicted: {predicted_non_exempt_total}, optimal: {optimal_non_exempt_total})'
-            )
-            relative_error = self._absolute_relative_error(predicted_non_exempt_total, optimal_non_exempt_total)
-            error_array[sample_index] = [relative_error, invalid_claim_ratio]
-            if relative_error < 0.05 and invalid_claim_ratio == 0:
-                tp += 1
-            else:
-                fp += 1
+        invalid_format_count = sum(prediction is None for prediction in predictions)
+        outcome_counts = {'tp': 0, 'fp': 0, 'fn': 0}
+        sample_results = self._map_samples('_score_optimal_exemptions_sample', predictions, targets, cases)
+        for sample_index, (errors, outcome) in enumerate(sample_results):
+            error_array[sample_index] = errors
+            outcome_counts[outcome] += 1
+        tp, fp, fn = outcome_counts['tp'], outcome_counts['fp'], outcome_counts['fn']
         # Compute precision, recall, f1 and MARE scores across all samples
         precision, recall, f1 = self._precision_recall_f1_from_outcomes(tp, fp, fn)
         mare, invalid_claim_ratio = np.nanmean(error_array, axis=0)
@@ -421,4 +435,109 @@ class Evaluator:
                 'f1': float(f1), 
                 'mare': mare,
                 'invalid_claim_ratio': invalid_claim_ratio,
-                'invalid_format': invalid_format_count}
\ No newline at end of file
+                'invalid_format': invalid_format_count}
+    
+    # Score a single TaskID.OPTIMAL_EXEMPTIONS sample
+    # Returns (relative error, invalid claim ratio) and the sample outcome ('tp', 'fp' or 'fn')
+    def _score_optimal_exemptions_sample(self, prediction: OptimalExemptionsResponse, target: Dict, case: Case):
+        if prediction is None: # Invalid response format
+            return [np.nan, 1], 'fn'
+        elif (not prediction.root) and (not target): # Edge case: optimal solution contains no claims
+            return [0, 0], 'tp'
+        elif not target: # Optimal solution contains no claims, but prediction does
+            return [np.nan, 1], 'fn'
+        # Validate predicted solution
+        normalized_prediction = {key.strip().lower(): value for key, value in prediction.root.items()}
+        predicted_jurisdiction = self._detect_jurisdiction(normalized_prediction, normalized=True)
+        allowable_jurisdictions = self.statute_set_map[case.state_jurisdiction].allowable_exemption_jurisdictions()
+        if predicted_jurisdiction is None or predicted_jurisdiction not in allowable_jurisdictions:
+            return [np.nan, 1], 'fn'
+        # Initialize predicted solution and validate claims
+        invalid_claim_count = 0
+        total_claim_count = 0
+        predicted_solution = self.solver.init_solution(case, predicted_jurisdiction)
+        asset_exemption_map, remaining_values = self._case_asset_map_for_jurisdiction(case, predicted_jurisdiction, normalized=True)
+        matching_asset_descriptions = self._match_asset_descriptions(list(normalized_prediction.keys()), list(asset_exemption_map.keys()))
+        for claims, matching_asset_description in zip(normalized_prediction.values(), matching_asset_descriptions):
+            total_claim_count += len(claims)
+            if matching_asset_description is None:
+                invalid_claim_count += len(claims)
+                continue
+            applicable_exemptions = asset_exemption_map[matching_asset_description]
+            # Sum claim values by normalized citation (plain floats, no intermediate Claim models)
+            deduped_claim_map = {}
+            for claim in claims:
+                citation = claim.normalized_citation
+                deduped_claim_map[citation] = deduped_claim_map.get(citation, 0) + claim.claim_value
+            for citation, claim_value in deduped_claim_map.items():
+                if (citation not in applicable_exemptions or 
+                    claim_value > remaining_values[matching_asset_description]):
+                    invalid_claim_count += 1
+                else:
+                    # Create checkpoint so we may revert if claim is invalid.
+                    solution_checkpoint = predicted_solution.snapshot()
+                    allocated_amount = predicted_solution.allocate_claim_amount(citation, claim_value)
+                    # If remaining claim value, check for additional item claims
+                    while ((claim_value - allocated_amount) > 0 and 
+                           predicted_solution.item_claim_exists(citation)):
+                        allocated_amount += predicted_solution.allocate_claim_amount(citation, claim_value - allocated_amount)
+                    # Over-allocated claims are treated as invalid.
+                    # Over-allocation occurs whenever claim value exceeds the maximum value allowed by law (allocated amount).
+                    if claim_value > allocated_amount:
+                        invalid_claim_count += 1
+                        predicted_solution.rollback(solution_checkpoint)
+                    elif allocated_amount > 0:
+                        remaining_values[matching_asset_description] -= allocated_amount
+                        predicted_solution.claim_exemption(citation, matching_asset_description, allocated_amount)
+        # All claims have been processed, any remaining dollar value is non-exempt
+        for asset_description, dollar_value in remaining_values.items():
+            if dollar_value > 0:
+                predicted_solution.set_non_exempt(asset_description, dollar_value)
+        # Compute invalid claim ratio
+        invalid_claim_ratio = invalid_claim_count / total_claim_count if total_claim_count > 0 else 0
+        # Perform sanity checks on optimal solution
+        # These checks will always pass if the same statutes and cases used to generate dataset are used for evaluation.
+        normalized_target = {
+            asset_description: [Claim(**claim_dict) for claim_dict in claim_dicts]
+            for asset_description, claim_dicts in target.items()
+        }
+        optimal_jurisdiction = self._detect_jurisdiction(normalized_target)
+        assert optimal_jurisdiction in allowable_jurisdictions, (
+            f'Unexpected error: jurisdiction for target solution ({optimal_jurisdiction}) is not an allowable jurisdiction: {allowable_jurisdictions}'
+        )
+        # Initialize optimal solution and process claims (with sanity checks)
+        optimal_solution = self.solver.init_solution(case, optimal_jurisdiction)
+        asset_exemption_map, remaining_values = self._case_asset_map_for_jurisdiction(case, optimal_jurisdiction)
+        for asset_description, claims in normalized_target.items():
+            assert asset_description in asset_exemption_map, (
+                f'Unexpected error: target solution contains asset description ({asset_description}) not found in case assets: {list(asset_exemption_map.keys())}'
+            )
+            applicable_exemptions = asset_exemption_map[asset_description]
+            for claim in claims:
+                assert claim.citation in applicable_exemptions, (
+                    f'Unexpected error: exemption citation in target solution ({claim.citation}) is not an allowable exemption: {sorted(applicable_exemptions)}'
+                )
+                allocated_amount = optimal_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value)
+                # If remaining claim value, check for additional item claims
+                while ((claim.claim_value - allocated_amount) > 0 and 
+                        optimal_solution.item_claim_exists(claim.normalized_citation)):
+                    allocated_amount += optimal_solution.allocate_claim_amount(claim.normalized_citation, claim.claim_value - allocated_amount)
+                
+                assert allocated_amount == claim.claim_value, (
+                    f'Unexpected error: claim in target solution ({claim}) is over-allocated (allocated amount: {allocated_amount})'
+                )
+                remaining_values[asset_description] -= allocated_amount
+                optimal_solution.claim_exemption(claim.normalized_citation, asset_description, allocated_amount)
+        # All claims have been processed, any remaining dollar value is non-exempt
+        for asset_description, dollar_value in remaining_values.items():
+            if dollar_value > 0:
+                optimal_solution.set_non_exempt(asset_description, dollar_value)
+        # Compare predicted and optimal solutions
+        predicted_non_exempt_total = predicted_solution.total_non_exempt_value()
+        optimal_non_exempt_total = optimal_solution.total_non_exempt_value()
+        assert optimal_non_exempt_total <= predicted_non_exempt_total, (
+            f'Unexpected error: encountered predicted solution which outperforms optimal solution (predicted: {predicted_non_exempt_total}, optimal: {optimal_non_exempt_total})'
+        )
+        relative_error = self._absolute_relative_error(predicted_non_exempt_total, optimal_non_exempt_total)
+        outcome = 'tp' if relative_error < 0.05 and invalid_claim_ratio == 0 else 'fp'
+        return [relative_error, invalid_claim_ratio], outcome
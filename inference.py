@@ -1,22 +1,139 @@
 import os
-import json
+import orjson
+import asyncio
 import argparse
+from itertools import repeat
+from concurrent.futures import ProcessPoolExecutor
+from logging import Logger
+from typing import List, Dict
 from dotenv import load_dotenv
 from source.config import Config
 from source.jurisdiction import Jurisdiction
 from source.statute_factory import StatuteFactory
-from source.task_dataset import TaskDataset
+from source.task_id import TaskID
+from source.task_dataset import Task, TaskDataset
 from source.task_suite import TaskSuite
 from source.model_id import ModelID
-from source.model_client import ModelClient
-from source.utils import read_jsonl_file, write_jsonl_file
-from open_exempt import configure_logger_with_name
+from source.model_client import ModelClient, BatchFailedError
+from source.utils import read_jsonl_file, write_jsonl_file, write_json_file
+from open_exempt import configure_logger_with_name, close_logger_with_name
 from evaluator import Evaluator
 
 # Load API keys from .env file
 load_dotenv()
 
-def run_dataset(dataset_directory: str, output_directory: str, model: ModelClient, evaluator: Evaluator, verbose: bool = True):
+# Load predictions from a partial predictions file as a {uid: prediction} map
+# The last line may be incomplete if the previous run was interrupted mid-write, so undecodable lines are skipped
+def read_partial_predictions(partial_file_path: str):
+    completed_predictions = {}
+    with open(partial_file_path, 'rb') as file:
+        for line in file:
+            try:
+                prediction_dict = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            completed_predictions[prediction_dict['uid']] = prediction_dict['prediction']
+    return completed_predictions
+
+# Append lines to the partial predictions file, called off the event loop
+def append_to_file(file, data: bytes):
+    file.write(data)
+    file.flush()
+
+# Single writer for the partial predictions file, drains the queue until it receives None
+# Predictions queued while a write is in progress are written together in the next write
+async def write_predictions(queue: asyncio.Queue, partial_file):
+    while True:
+        items = [await queue.get()]
+        while not queue.empty():
+            items.append(queue.get_nowait())
+        data = b''.join(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE) for item in items if item is not None)
+        if data:
+            await asyncio.to_thread(append_to_file, partial_file, data)
+        if items[-1] is None:
+            return
+
+# Run inference on tasks concurrently (bounded by max_concurrency), predictions are returned in task order
+# Each prediction is queued for the partial predictions file as soon as it is received, and tasks with
+# a prediction in this file are skipped, so an interrupted run resumes where it stopped
+async def run_tasks(tasks: List[Task], model: ModelClient, logger: Logger, max_concurrency: int, partial_file_path: str):
+    completed_predictions = {}
+    if os.path.exists(partial_file_path):
+        completed_predictions = read_partial_predictions(partial_file_path)
+        # Rewrite partial file with complete lines only, so new predictions are not appended to a truncated line
+        write_jsonl_file(partial_file_path, [{'uid': uid, 'prediction': prediction} for uid, prediction in completed_predictions.items()])
+        logger.info(f'Resuming inference with {len(completed_predictions)} predictions from: {partial_file_path}')
+    predictions = [None] * len(tasks)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    queue = asyncio.Queue(maxsize=1024) # Bounded, so inference waits on the writer if writes fall behind
+
+    # Wait until the item is queued or the writer stops, so a failed writer cannot leave producers blocked on a full queue
+    async def enqueue(item: Dict):
+        put = asyncio.ensure_future(queue.put(item))
+        await asyncio.wait((put, writer), return_when=asyncio.FIRST_COMPLETED)
+        if not put.done():
+            put.cancel()
+            writer.result() # Raises the writer's exception
+            raise RuntimeError('Prediction writer stopped before inference finished.')
+
+    async def run_task(index: int, task: Task):
+        if task.uid in completed_predictions:
+            predictions[index] = {'uid': task.uid, 'prediction': completed_predictions[task.uid]}
+            return
+        async with semaphore:
+            logger.info(f'Begin inference on task: {task.uid}')
+            prediction = await model.acomplete(task.prompt())
+            predictions[index] = {'uid': task.uid, 'prediction': prediction}
+            await enqueue(predictions[index])
+            logger.info(f'Finished inference on task: {task.uid}')
+
+    with open(partial_file_path, 'ab') as partial_file:
+        writer = asyncio.create_task(write_predictions(queue, partial_file))
+        inference_tasks = [asyncio.create_task(run_task(index, task)) for index, task in enumerate(tasks)]
+        try:
+            await asyncio.gather(*inference_tasks)
+        except BaseException: # If any task fails, cancel the remaining tasks before the writer is stopped
+            for inference_task in inference_tasks:
+                inference_task.cancel()
+            await asyncio.gather(*inference_tasks, return_exceptions=True)
+            raise
+        finally: # Write predictions received before any failure, so they are not lost (writer exceptions are raised here)
+            await enqueue(None)
+            await writer
+    return predictions
+
+# Run inference on tasks as a single provider batch job
+# Batch ID is saved to file, so an interrupted run resumes waiting on the same batch rather than resubmitting
+# The file is removed if the batch fails (so the next run submits a new batch), and by run_dataset once predictions are saved
+def run_batch(tasks: List[Task], model: ModelClient, batch_id_file_path: str, logger: Logger):
+    if os.path.exists(batch_id_file_path):
+        with open(batch_id_file_path, 'r') as file:
+            batch_id = file.read().strip()
+        logger.info(f'Resuming batch: {batch_id}')
+    else:
+        batch_id = model.submit_batch([(task.uid, task.prompt()) for task in tasks])
+        with open(batch_id_file_path, 'w') as file:
+            file.write(batch_id)
+        logger.info(f'Submitted batch: {batch_id}')
+    try:
+        predictions = model.await_batch(batch_id, [task.uid for task in tasks])
+    except BatchFailedError:
+        os.remove(batch_id_file_path)
+        logger.error(f'Batch failed and will be resubmitted on the next run: {batch_id}')
+        raise
+    logger.info(f'Finished batch: {batch_id}')
+    return predictions
+
+# Saved targets are only reused if they were written after the dataset files they were built from
+# A dataset regenerated under the same name is newer than its saved targets, so targets are rebuilt
+def saved_targets_are_current(target_file_path: str, dataset: TaskDataset):
+    if not os.path.exists(target_file_path):
+        return False
+    target_modification_time = os.stat(target_file_path).st_mtime_ns
+    dataset_file_paths = (dataset.task_file_path(), dataset.shared_component_file_path())
+    return all(target_modification_time > os.stat(path).st_mtime_ns for path in dataset_file_paths)
+
+def run_dataset(dataset_directory: str, output_directory: str, model: ModelClient, evaluator: Evaluator, verbose: bool = True, max_concurrency: int = 16, use_batch: bool = False):
     # Load dataset
     config = Config.from_directory(dataset_directory)
     dataset = TaskDataset.from_config(config)
@@ -25,6 +142,9 @@ def run_dataset(dataset_directory: str, output_directory: str, model: ModelClien
     prediction_directory = os.path.join(output_directory, dataset.dataset_id)
     prediction_file_path = os.path.join(prediction_directory, 'predictions.jsonl')
     result_file_path = os.path.join(prediction_directory, 'results.jsonl')
+    target_file_path = os.path.join(prediction_directory, 'targets.jsonl')
+    partial_prediction_file_path = prediction_file_path + '.partial'
+    batch_id_file_path = os.path.join(prediction_directory, 'batch_id.txt')
     os.makedirs(prediction_directory, exist_ok=True)
 
     # We don't overwrite files, so if predictions do not exist, neither should results.
@@ -34,8 +154,6 @@ def run_dataset(dataset_directory: str, output_directory: str, model: ModelClien
     # Setup logging
     log_file_path = os.path.join(prediction_directory, 'log.log')
     logger = configure_logger_with_name(dataset.name, log_file_path, verbose)
-    if not verbose:
-        logger.disabled = True
     logger.info('OpenExempt initialized.')
 
     # If predictions exist, load them and skip to evaluation
@@ -46,45 +164,59 @@ def run_dataset(dataset_directory: str, output_directory: str, model: ModelClien
     else:
         # Run inference on dataset
         logger.info(f'Begin inference on dataset: {dataset.dataset_id}')
-        predictions = []
-        for task in dataset.get_data():
-            logger.info(f'Begin inference on task: {task.uid}')
-            model.start_new_conversation()
-            prediction = model(task.prompt())
-            predictions.append({'uid': task.uid, 'prediction': prediction})
-            logger.info(f'Finished inference on task: {task.uid}')
+        tasks = list(dataset.get_data())
+        if use_batch and model.supports_batch:
+            predictions = run_batch(tasks, model, batch_id_file_path, logger)
+        else:
+            predictions = asyncio.run(run_tasks(tasks, model, logger, max_concurrency, partial_prediction_file_path))
         logger.info(f'Finished inference on dataset: {dataset.dataset_id}')
 
         # Save predictions
         logger.info(f'Begin saving predictions to path: {prediction_file_path}')
         write_jsonl_file(prediction_file_path, predictions)
+        # Predictions are complete, partial and batch ID files are no longer needed
+        for resume_file_path in (partial_prediction_file_path, batch_id_file_path):
+            if os.path.exists(resume_file_path):
+                os.remove(resume_file_path)
         logger.info('Finished saving predictions.')
     
     # If results exist, skip evaluation
     if os.path.exists(result_file_path):
         logger.info(f'Skipping evaluation. Results for this dataset already exist at: {result_file_path}.')
-        with open(result_file_path, 'r') as file:
-            results = json.load(file)
+        with open(result_file_path, 'rb') as file:
+            results = orjson.loads(file.read())
     else:
         # Run evaluation on dataset
         logger.info(f'Begin evaluation on dataset: {dataset.dataset_id}')
-        tasks = [task for task in dataset.get_data()]
-        cases = [case for case in dataset.get_cases()]
-        targets = [task.to_target() for task in tasks]
-        task_id = tasks[0].terminal_task_id
+        # Targets are saved on first evaluation, so re-evaluation does not reload tasks
+        if saved_targets_are_current(target_file_path, dataset):
+            logger.info(f'Loading targets at: {target_file_path}.')
+            targets = read_jsonl_file(target_file_path)
+            cases = list(dataset.get_cases())
+        else:
+            targets, cases = [], []
+            for task, case in dataset.get_data_with_cases(): # Targets and cases are built in one pass
+                targets.append(task.to_target())
+                cases.append(case)
+            write_jsonl_file(target_file_path, targets)
+        task_id = TaskID(config.terminal_task_id)
         results = evaluator.evaluate(task_id, predictions, targets, cases, logger)
         logger.info(f'Finished evaluation on dataset: {dataset.dataset_id}')
 
         # Save results
         logger.info(f'Begin saving results to path: {result_file_path}')
         results = {'dataset_id': dataset.dataset_id, 'model_id': model.model_id.value, **results}
-        with open(result_file_path, 'w') as file:
-            json.dump(results, file, indent=4)
+        write_json_file(result_file_path, results)
         logger.info('Finished saving results.')
     logger.info('OpenExempt finished.')
+    close_logger_with_name(dataset.name) # Flush log file (atexit handlers do not run in suite worker processes)
     return (config, predictions, results)
 
-def run_suite(suite_directory: str, output_directory: str, model: ModelClient, evaluator: Evaluator, verbose: bool = True):
+# Worker process entry point for run_suite, model clients are not picklable so each worker creates its own
+def run_dataset_with_model_id(dataset_directory: str, output_directory: str, model_id: ModelID, cache_path: str, evaluator: Evaluator, verbose: bool, max_concurrency: int, use_batch: bool):
+    return run_dataset(dataset_directory, output_directory, ModelClient(model_id, cache_path), evaluator, verbose, max_concurrency, use_batch)
+
+def run_suite(suite_directory: str, output_directory: str, model: ModelClient, evaluator: Evaluator, verbose: bool = True, max_concurrency: int = 16, use_batch: bool = False, dataset_workers: int = 1):
     # Load suite
     suite = TaskSuite.from_directory(suite_directory)
 
@@ -95,29 +227,47 @@ def run_suite(suite_directory: str, output_directory: str, model: ModelClient, e
     # Setup logging
     log_file_path = os.path.join(suite_output_directory, 'log.log')
     logger = configure_logger_with_name(suite.name, log_file_path, verbose)
-    if not verbose:
-        logger.disabled = True
     logger.info('OpenExempt initialized.')
 
     # Run inference on suite
-    experiments = []
-    for dataset_directory in suite.get_dataset_directories():
-        logger.info(f'Begin inference on dataset at: {dataset_directory}')
-        experiment = run_dataset(dataset_directory, suite_output_directory, model, evaluator, verbose)
-        experiments.append(experiment)
-        logger.info(f'Finished inference on dataset at: {dataset_directory}')
+    dataset_directories = list(suite.get_dataset_directories())
+    if dataset_workers > 1:
+        # Datasets have separate output directories and loggers, so they can be run in parallel (experiments keep suite order)
+        logger.info(f'Begin inference on {len(dataset_directories)} datasets with {dataset_workers} workers')
+        with ProcessPoolExecutor(max_workers=min(dataset_workers, len(dataset_directories))) as executor:
+            experiments = list(executor.map(run_dataset_with_model_id,
+                                            dataset_directories,
+                                            repeat(suite_output_directory),
+                                            repeat(model.model_id),
+                                            repeat(model.cache_path),
+                                            repeat(evaluator),
+                                            repeat(verbose),
+                                            repeat(max_concurrency),
+                                            repeat(use_batch)))
+        logger.info(f'Finished inference on {len(dataset_directories)} datasets')
+    else:
+        experiments = []
+        for dataset_directory in dataset_directories:
+            logger.info(f'Begin inference on dataset at: {dataset_directory}')
+            experiment = run_dataset(dataset_directory, suite_output_directory, model, evaluator, verbose, max_concurrency, use_batch)
+            experiments.append(experiment)
+            logger.info(f'Finished inference on dataset at: {dataset_directory}')
     logger.info('OpenExempt finished.')
     return experiments
 
-def run_inference(mode: str, model_id: ModelID, directory: str, output_directory: str, statute_directory: str, verbose: bool = True):
-    model = ModelClient(model_id)
+def run_inference(mode: str, model_id: ModelID, directory: str, output_directory: str, statute_directory: str, verbose: bool = True, eval_workers: int = 1, max_concurrency: int = 16, use_batch: bool = False, dataset_workers: int = 1, use_cache: bool = False):
     model_output_directory = os.path.join(output_directory, model_id.value) # Each model has its own output directory
+    cache_path = None
+    if use_cache: # Predictions are cached per model, across datasets and suites
+        os.makedirs(model_output_directory, exist_ok=True)
+        cache_path = os.path.join(model_output_directory, 'prediction_cache.sqlite')
+    model = ModelClient(model_id, cache_path)
     statute_sets = StatuteFactory.load_statute_sets(statute_directory, list(Jurisdiction))
-    evaluator = Evaluator(statute_sets)
+    evaluator = Evaluator(statute_sets, max_workers=eval_workers)
     if mode == 'dataset':
-        return run_dataset(directory, model_output_directory, model, evaluator, verbose)
+        return run_dataset(directory, model_output_directory, model, evaluator, verbose, max_concurrency, use_batch)
     elif mode == 'suite':
-        return run_suite(directory, model_output_directory, model, evaluator, verbose)
+        return run_suite(directory, model_output_directory, model, evaluator, verbose, max_concurrency, use_batch, dataset_workers)
     else:
         raise ValueError(f'Invalid inference mode: {mode}')
 
@@ -130,6 +280,11 @@ if __name__ == "__main__":
     parser.add_argument('-o', '--output_directory', default='predictions', help='Path to root output directory.')
     parser.add_argument('-s', '--statute_directory', default='data/statutes', help='Path to statute directory.')
     parser.add_argument('-v', '--verbose', action='store_true')
+    parser.add_argument('--max_concurrency', type=int, default=16, help='Maximum number of concurrent model requests.')
+    parser.add_argument('--batch', action='store_true', help='Use provider batch API for inference (if supported by model host).')
+    parser.add_argument('--dataset_workers', type=int, default=1, help='Number of worker processes used to run suite datasets in parallel.')
+    parser.add_argument('--use_cache', action='store_true', help='Reuse cached predictions for identical model and prompt pairs.')
+    parser.add_argument('--eval_workers', type=int, default=1, help='Number of worker processes used to score samples during evaluation.')
     args = parser.parse_args()
     model_id = ModelID(args.model)
-    run_inference(args.mode, model_id, args.directory, args.output_directory, args.statute_directory, args.verbose)
\ No newline at end of file
+    run_inference(args.mode, model_id, args.directory, args.output_directory, args.statute_directory, args.verbose, args.eval_workers, args.max_concurrency, args.batch, args.dataset_workers, args.use_cache)
\ No newline at end of file
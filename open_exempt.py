@@ -1,7 +1,13 @@
 import os
 import random
+import queue
+import atexit
 import argparse
 import logging
+from typing import List
+from logging.handlers import QueueHandler, QueueListener
+from source.asset import Asset
+from source.asset_factory import AssetFactory
 from source.config import Config
 from source.suite_id import SuiteID
 from source.case_generator import CaseGenerator
@@ -11,28 +17,51 @@ from source.task_suite import TaskSuite
 from source.utils import set_random_seed
 
 
+# Log records are written to file by a background listener thread, so logging calls only enqueue records
+# Listeners are tracked per logger name, and are stopped when the logger is reconfigured, closed or at exit
+_log_listeners = {}
+
 def configure_logger_with_name(name: str, log_file_path: str, verbose: bool):
+    close_logger_with_name(name)
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
-    logger.handlers.clear()
     if verbose:
-        handler = logging.FileHandler(log_file_path)
+        file_handler = logging.FileHandler(log_file_path)
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
-    else:
-        logger.disabled = True
+        file_handler.setFormatter(formatter)
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, file_handler)
+        listener.start()
+        _log_listeners[name] = listener
+        logger.addHandler(QueueHandler(log_queue))
+    # Silent loggers have no handler (no log file is opened), and are disabled so records are dropped immediately
+    logger.disabled = not verbose
     logger.propagate = False
     return logger
 
-def generate_demo(config: Config):
-    case_generator = CaseGenerator(config)
+# Write any queued log records, then stop the listener and remove handlers for logger
+def close_logger_with_name(name: str):
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    listener = _log_listeners.pop(name, None)
+    if listener:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+@atexit.register
+def _close_all_loggers():
+    for name in list(_log_listeners):
+        close_logger_with_name(name)
+
+def generate_demo(config: Config, assets: List[Asset] = None):
+    case_generator = CaseGenerator(config, assets)
     task_generator = TaskGenerator(config)
     case = case_generator.generate_case()
     task = task_generator.generate_task(case)
     return case, task
 
-def generate_dataset(config: Config, verbose: bool = True):
+def generate_dataset(config: Config, verbose: bool = True, assets: List[Asset] = None):
     # Setup dataset directory
     assert not os.path.exists(config.dataset_directory), 'Dataset with this name already exist.'
     os.mkdir(config.dataset_directory)
@@ -45,7 +74,7 @@ def generate_dataset(config: Config, verbose: bool = True):
     # Create dataset as specified in config file
     logger.info('Begin dataset generation.')
     dataset = TaskDataset(config.dataset_name, config.dataset_id, config.dataset_directory)
-    case_generator = CaseGenerator(config)
+    case_generator = CaseGenerator(config, assets)
     task_generator = TaskGenerator(config)
     # Every dataset includes a dev set with 5 samples
     for index in range(config.dataset_size + 5):
@@ -73,9 +102,12 @@ def generate_suite(suite_id: SuiteID, verbose: bool = True):
     # Create all datasets in suite
     logger.info('Begin suite generation.')
     suite = TaskSuite(suite_id, suite_directory)
+    asset_map = {} # Assets are loaded once per asset directory and shared by all datasets (case generation does not modify assets)
     for dataset_config in suite_id.create_suite_configs():
         logger.info(f'Begin generating dataset: {dataset_config.dataset_name}.')
-        dataset = generate_dataset(dataset_config, verbose)
+        if dataset_config.asset_directory not in asset_map:
+            asset_map[dataset_config.asset_directory] = AssetFactory.load_assets(dataset_config.asset_directory)
+        dataset = generate_dataset(dataset_config, verbose, asset_map[dataset_config.asset_directory])
         logger.info(f'Finished generating dataset: {dataset_config.dataset_name}.')
         suite.add_dataset(dataset)
     logger.info('Finished suite generation.')
@@ -1,20 +1,32 @@
+import sys
 from dataclasses import dataclass
 from typing import List
 
 
-@dataclass
+@dataclass(slots=True)
 class Asset:
     description: str
     dollar_value: float
     applicable_exemptions: List[str] # List of applicable exemption citations across all jurisdictions
     category_hints: List[str] # Used only in the asset selection process, not exemption applicability
 
+    # Exemption citations are shared by many assets, so loaded citations are interned (one string object per citation)
+    @staticmethod
+    def create_asset(description: str, dollar_value: float, applicable_exemptions: List[str], category_hints: List[str]):
+        return Asset(description, 
+                     dollar_value, 
+                     [sys.intern(citation) for citation in applicable_exemptions], 
+                     category_hints)
+
     def __str__(self):
         exemptions = ','.join(self.applicable_exemptions) if self.applicable_exemptions else 'None'
         return f'Asset(description: {self.description}, value: {self.dollar_value:,}, exemptions: {exemptions})'
 
     def to_dict(self):
-        return vars(self)
+        return {'description': self.description,
+                'dollar_value': self.dollar_value,
+                'applicable_exemptions': self.applicable_exemptions,
+                'category_hints': self.category_hints}
     
     def formatted_dollar_value(self):
-        return '${:,.2f}'.format(self.dollar_value)
\ No newline at end of file
+        return f'${self.dollar_value:,.2f}'
\ No newline at end of file
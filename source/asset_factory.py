@@ -24,7 +24,7 @@ class AssetFactory:
         if not os.path.exists(directory):
             os.mkdir(directory)
         file_names = file_names_with_extension(directory, 'json')
-        existing_assets = list(map(lambda file_name: os.path.splitext(file_name)[0], file_names))
+        existing_assets = set(map(lambda file_name: os.path.splitext(file_name)[0], file_names)) # Set for constant time lookups
 
         asset_index = 0
         for asset in assets:
@@ -43,7 +43,7 @@ class AssetFactory:
     def load_assets(directory: str, file_name: str = 'assets.jsonl'):
         file_path = os.path.join(directory, file_name)
         asset_dicts = read_jsonl_file(file_path)
-        return [Asset(**asset_dict) for asset_dict in asset_dicts]
+        return [Asset.create_asset(**asset_dict) for asset_dict in asset_dicts]
 
     # Load all assets from a directory where each asset is stored as its own json file
     @staticmethod
@@ -53,5 +53,5 @@ class AssetFactory:
             asset_path = os.path.join(directory, file_name)
             with open(asset_path, 'r') as file:
                 asset_dict = json.load(file)
-            assets.append(Asset(**asset_dict))
+            assets.append(Asset.create_asset(**asset_dict))
         return assets
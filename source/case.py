@@ -7,7 +7,7 @@ from .asset import Asset
 from .jurisdiction import Jurisdiction
 
 
-@dataclass
+@dataclass(slots=True)
 class Case:
     debtor: Party
     joint_debtor: Party
@@ -26,10 +26,10 @@ class Case:
         
         return Case(Party(**debtor), 
                     Party(**joint_debtor) if joint_debtor else None, 
-                    [Asset(**asset) for asset in assets], 
-                    Jurisdiction(state_jurisdiction), 
+                    [Asset.create_asset(**asset) for asset in assets], 
+                    Jurisdiction.of(state_jurisdiction), 
                     datetime.fromisoformat(petition_date), 
-                    {datetime.fromisoformat(date): Jurisdiction(state) for date, state in domicile_dates.items()})
+                    {datetime.fromisoformat(date): Jurisdiction.of(state) for date, state in domicile_dates.items()})
     
     def has_married_couple(self):
         return bool(self.joint_debtor)
@@ -47,7 +47,12 @@ class Case:
         return 'Debtors' if self.has_married_couple() else 'Debtor'
     
     def to_dict(self):
-        return vars(self)
+        return {'debtor': self.debtor,
+                'joint_debtor': self.joint_debtor,
+                'assets': self.assets,
+                'state_jurisdiction': self.state_jurisdiction,
+                'petition_date': self.petition_date,
+                'domicile_dates': self.domicile_dates}
     
     def serialize(self):
         return {
@@ -1,8 +1,10 @@
 import os
-import string
 import random
 from math import ceil
-from typing import Dict, List
+from heapq import nlargest
+from operator import itemgetter
+from dataclasses import replace
+from typing import List
 from datetime import datetime, timedelta
 from .config import Config
 from .jurisdiction import Jurisdiction
@@ -15,13 +17,19 @@ from .utils import read_jsonl_file, infinite_sampler, infinite_sample
 
 class CaseGenerator:
 
-    def __init__(self, config: Config):
+    # Assets may be preloaded and shared across case generators (e.g. all datasets in a suite)
+    def __init__(self, config: Config, assets: List[Asset] = None):
         self.config = config
         self.party_sampler = infinite_sampler(self.load_parties(self.config.data_directory))
-        self.asset_sampler = infinite_sampler(AssetFactory.load_assets(self.config.asset_directory))
+        self.asset_sampler = infinite_sampler(assets if assets is not None else AssetFactory.load_assets(self.config.asset_directory))
         self.jurisdiction_sampler = self.create_jurisdiction_sampler()
         self.is_married_sampler = self.create_is_married_sampler()
         self.residence_count_sampler = self.create_domicile_count_sampler()
+        # Placeholders are used to ensure applicable state matches jurisdiction argument (one placeholder index per state)
+        self.placeholders = range(self.config.state_jurisdiction_count())
+        # Remaining states for each applicable state, which are shuffled and assigned to the other placeholders
+        self.other_states_map = {state: [other_state for other_state in self.config.state_jurisdictions if other_state != state] 
+                                 for state in self.config.state_jurisdictions}
 
     def load_parties(self, data_directory: str):
         file_path = os.path.join(data_directory, 'parties.jsonl')
@@ -32,7 +40,7 @@ class CaseGenerator:
         count_per_jurisdiction = ceil(self.config.dataset_size / self.config.state_jurisdiction_count())
         jurisdiction_list = []
         for jurisdiction in self.config.state_jurisdictions:
-            jurisdiction_list.extend([jurisdiction] * count_per_jurisdiction)
+            jurisdiction_list.extend([Jurisdiction.of(jurisdiction)] * count_per_jurisdiction)
         return infinite_sampler(jurisdiction_list)
     
     def create_is_married_sampler(self):
@@ -73,19 +81,18 @@ class CaseGenerator:
         random_day = random.randint(0, total_days)
         return first_day + timedelta(days=random_day)
     
-    def sample_domicile_dates(self, petition_date: datetime, domicile_count: int):
+    # Domicile dates are sampled as day offsets before the petition date (in chronological order)
+    # Dates are only created once offsets are accepted, so rerolls do not create dates
+    def sample_domicile_offsets(self, petition_date: datetime, domicile_count: int):
         # Create first domicile date which occurred before (730 + 180) day period (see 11 U.S.C. 522(b)(3)(A))
         lookback_period = 730 + 180 + 1
         twenty_years_prior = petition_date.replace(year=2004)
         total_days = (petition_date - twenty_years_prior).days
-        random_day = random.randint(lookback_period, total_days)
-        first_date = petition_date - timedelta(days=random_day)
+        first_offset = random.randint(lookback_period, total_days)
 
         # Create remaining domicile dates within (730 + 180) day period
-        remaining_days = random.sample(range(lookback_period), domicile_count - 1)
-        remaining_days.sort(reverse=True)
-        remaining_dates = [petition_date - timedelta(days=days) for days in remaining_days]
-        return [first_date] + remaining_dates
+        remaining_offsets = sorted(random.sample(range(lookback_period), domicile_count - 1), reverse=True)
+        return [first_offset] + remaining_offsets
     
     # Ensure assets are unique
     def replace_duplicate_assets(self, assets: List[Asset]):
@@ -121,75 +128,53 @@ class CaseGenerator:
         # This occurs when two states are tied for most days domiciled
         # When this happens, we simply reroll
         while applicable_state_placeholder == None:
-            dates = self.sample_domicile_dates(petition_date, domicile_count)
+            offsets = self.sample_domicile_offsets(petition_date, domicile_count)
             # Randomly assign placeholders to each date
-            # Placeholders are used to ensure applicable state matches jurisdiction argument
-            placeholders = list(string.ascii_lowercase[:self.config.state_jurisdiction_count()])
-            assignments = random.choices(placeholders, k=len(dates))
-            placeholder_dates = dict(zip(dates, assignments))
-            applicable_state_placeholder = self.determine_applicable_state_jurisdiction(petition_date, placeholder_dates)
+            assignments = random.choices(self.placeholders, k=len(offsets))
+            applicable_state_placeholder = self.determine_applicable_state_jurisdiction(offsets, assignments)
 
         # Create final domicile dates by replacing placeholders with state jurisdictions
-        states = self.config.state_jurisdictions.copy()
-        states.remove(state_jurisdiction.value)
+        states = self.other_states_map[state_jurisdiction.value].copy()
         random.shuffle(states)
         state_index = 0
         assigned_placeholders = {applicable_state_placeholder: state_jurisdiction}
         domicile_dates = {}
-        for date, placeholder in placeholder_dates.items():
+        for offset, placeholder in zip(offsets, assignments):
             if placeholder not in assigned_placeholders:
-                assigned_placeholders[placeholder] = Jurisdiction(states[state_index])
+                assigned_placeholders[placeholder] = Jurisdiction.of(states[state_index])
                 state_index += 1
-            domicile_dates[date] = assigned_placeholders[placeholder]
+            domicile_dates[petition_date - timedelta(days=offset)] = assigned_placeholders[placeholder]
         return domicile_dates
 
-    def determine_applicable_state_jurisdiction(self, petition_date: datetime, domicile_dates: Dict[datetime, str]):
-        # Evaluate 730-day period prior to petition date
-        two_years_prior = petition_date - timedelta(days=730)
-        domicile_count = len(domicile_dates)
-        dates = list(domicile_dates.keys())
-        days_per_state = {}
-        for index, (date, label) in enumerate(domicile_dates.items()):
-            current_date = max(date, two_years_prior) # Only consider past two years
-            if index < (domicile_count - 1):
-                next_date = max(dates[index + 1], two_years_prior)
-            else: # Last date
-                next_date = petition_date
-            delta = (next_date - current_date).days
-            if delta > 0:
-                if label not in days_per_state:
-                    days_per_state[label] = 0
-                days_per_state[label] += delta
+    # Domicile dates are given as day offsets before the petition date (in chronological order) with their placeholder labels
+    def determine_applicable_state_jurisdiction(self, offsets: List[int], labels: List[int]):
+        next_offsets = offsets[1:] + [0] # Last domicile extends to the petition date
+
+        # Days per state are accumulated for both periods in a single pass over the domiciles
+        # 730-day period prior to petition date, and the 180 days prior to 730-day period
+        # Days are indexed by placeholder
+        two_year_days_per_state = [0] * len(self.placeholders)
+        prior_days_per_state = [0] * len(self.placeholders)
+        for offset, next_offset, label in zip(offsets, next_offsets, labels):
+            two_year_delta = min(offset, 730) - min(next_offset, 730)
+            if two_year_delta > 0:
+                two_year_days_per_state[label] += two_year_delta
+            prior_delta = min(offset, 730 + 180) - max(next_offset, 730)
+            if prior_delta > 0:
+                prior_days_per_state[label] += prior_delta
 
         # If domiciled in a single state for 730-period, return that state
-        if len(days_per_state) == 1:
-            return next(iter(days_per_state))
+        two_year_states = [label for label, days in enumerate(two_year_days_per_state) if days > 0]
+        if len(two_year_states) == 1:
+            return two_year_states[0]
         
-        # Evaluate the 180 days prior to 730-day period
-        two_and_half_years_prior = petition_date - timedelta(days=730 + 180)
-        days_per_state = {}
-        for index, (date, label) in enumerate(domicile_dates.items()):
-            if date >= two_years_prior:
-                continue
-            current_date = max(date, two_and_half_years_prior)
-            if index < (domicile_count - 1):
-                next_date = min(dates[index + 1], two_years_prior)
-            else: # Last date
-                next_date = petition_date
-            delta = (next_date - current_date).days
-            if delta > 0:
-                if label not in days_per_state:
-                    days_per_state[label] = 0
-                days_per_state[label] += delta
-
         # If domiciled in a single state for 180-period, return that state
-        if len(days_per_state) == 1:
-            return next(iter(days_per_state))
+        prior_states = [label for label, days in enumerate(prior_days_per_state) if days > 0]
+        if len(prior_states) == 1:
+            return prior_states[0]
         
-        sorted_days_per_state = dict(sorted(days_per_state.items(), key=lambda item: item[1]))
-        sorted_iter = iter(sorted_days_per_state.items())
-        first_state = next(sorted_iter)
-        second_state = next(sorted_iter)
+        # Select the two states with the most days domiciled
+        first_state, second_state = nlargest(2, enumerate(prior_days_per_state), key=itemgetter(1))
 
         # If two states are tied for most days domiciled, return None
         if first_state[1] == second_state[1]:
@@ -199,15 +184,13 @@ class CaseGenerator:
     def generate_case(self):
         is_married = self.sample_is_married()
         asset_count = random.randint(self.config.asset_count_min, self.config.asset_count_max)
-        state_jurisdiction = self.sample_jurisdiction()
         debtor = self.sample_party()
         if is_married:
-            joint_debtor = self.sample_party()
-            joint_debtor.last_name = debtor.last_name
+            joint_debtor = replace(self.sample_party(), last_name=debtor.last_name)
         else:
             joint_debtor = None
         assets = self.sample_assets(asset_count)
-        state_jurisdiction = Jurisdiction(self.sample_jurisdiction())
+        state_jurisdiction = self.sample_jurisdiction()
         petition_date = self.sample_petition_date()
         domicile_count = self.sample_domicile_count()
         domicile_dates = self.create_domicile_dates(petition_date, domicile_count, state_jurisdiction)
@@ -1,4 +1,5 @@
 from enum import Enum, unique
+from functools import cache
 
 
 @unique
@@ -10,13 +11,25 @@ class Jurisdiction(Enum):
     PA = 'PENNSYLVANIA'
     WI = 'WISCONSIN'
 
+    # Jurisdiction display names are static, so they are computed once and shared by all callers
     @staticmethod
+    @cache
     def supported_jurisdictions():
-        return [member.display_name() for member in Jurisdiction]
+        return tuple(member.display_name() for member in Jurisdiction)
     
     @staticmethod
+    @cache
     def supported_state_jurisdictions():
-        return [member.display_name() for member in Jurisdiction if not member.is_federal()]
+        return tuple(member.display_name() for member in Jurisdiction if not member.is_federal())
+    
+    # Lookup by value through a prebuilt table, rather than the Enum constructor
+    # Values missing from the table fall back to the Enum constructor, which accepts members and raises ValueError for invalid values
+    @staticmethod
+    def of(value: str):
+        try:
+            return _JURISDICTION_BY_VALUE[value]
+        except (KeyError, TypeError):
+            return Jurisdiction(value)
     
     def display_name(self):
         return self.value.title()
@@ -25,4 +38,7 @@ class Jurisdiction(Enum):
         return self.value.lower() + '.json'
 
     def is_federal(self):
-        return self == Jurisdiction.FEDERAL
\ No newline at end of file
+        return self == Jurisdiction.FEDERAL
+
+
+_JURISDICTION_BY_VALUE = {member.value: member for member in Jurisdiction}
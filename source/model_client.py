@@ -1,20 +1,29 @@
-from typing import List
+import json
+import time
+from typing import List, Tuple
 from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 from .model_id import ModelID, ModelHost
+from .prediction_cache import PredictionCache
+
+
+# Raised when a batch job ends without a usable result (failed, expired, cancelled or missing responses)
+# The batch cannot be resumed, so callers should submit a new batch
+class BatchFailedError(RuntimeError):
+    pass
 
 
 class ModelClient:
     _retries = 3
     _timeout = 600
+    _batch_poll_interval = 60 # Seconds between batch status checks
+    _batch_endpoint = '/v1/chat/completions'
 
-    def __init__(self, model_id: ModelID):
+    def __init__(self, model_id: ModelID, cache_path: str = None):
         self.model_id = model_id
         self.model = self._init_model()
         self.messages: List[BaseMessage] = []
+        self.cache_path = cache_path
+        self.cache = PredictionCache(cache_path) if cache_path else None # Optional on-disk cache for single-turn completions
 
     def _init_model(self):
         api_key = self.model_id.get_api_key()
@@ -24,14 +33,19 @@ class ModelClient:
             "api_key": api_key
         }
         parameters.update(self.model_id.model_parameters())
+        # Provider integrations are imported on demand, so only the SDK for the selected host is loaded
         match self.model_id.host:
             case ModelHost.OPENAI:
+                from langchain_openai import ChatOpenAI
                 model = ChatOpenAI(**parameters)
             case ModelHost.ANTHROPIC:
+                from langchain_anthropic import ChatAnthropic
                 model = ChatAnthropic(**parameters)
             case ModelHost.GOOGLE:
+                from langchain_google_genai import ChatGoogleGenerativeAI
                 model = ChatGoogleGenerativeAI(**parameters)
             case ModelHost.HUGGINGFACE:
+                from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
                 hf_parameters = {'repo_id': self.model_id.hf_repo_id, 
                                  "timeout": ModelClient._timeout,
                                  'huggingfacehub_api_token': api_key}
@@ -48,5 +62,63 @@ class ModelClient:
         self.messages.append(response)
         return response.content
     
+    # Single-turn completion which does not use the shared conversation, so concurrent calls do not interfere
+    async def acomplete(self, prompt: str, system_prompt: str = None):
+        cache_key = PredictionCache.key(self.model_id, f'{system_prompt}\0{prompt}' if system_prompt else prompt) if self.cache else None
+        if cache_key:
+            cached_prediction = self.cache.get(cache_key)
+            if cached_prediction is not None:
+                return cached_prediction
+        messages = [SystemMessage(content=system_prompt)] if system_prompt else []
+        messages.append(HumanMessage(content=prompt))
+        response = await self.model.ainvoke(messages)
+        if cache_key:
+            self.cache.set(cache_key, response.content)
+        return response.content
+    
     def start_new_conversation(self, system_prompt: str = None):
-        self.messages = [SystemMessage(content=system_prompt)] if system_prompt else []
\ No newline at end of file
+        self.messages = [SystemMessage(content=system_prompt)] if system_prompt else []
+    
+    # Batch inference is currently supported for OpenAI models (https://platform.openai.com/docs/guides/batch)
+    @property
+    def supports_batch(self):
+        return self.model_id.host == ModelHost.OPENAI
+    
+    def _batch_client(self):
+        assert self.supports_batch, f'Batch inference not supported for host: {self.model_id.host}'
+        from openai import OpenAI
+        return OpenAI(api_key=self.model_id.get_api_key(), timeout=ModelClient._timeout)
+    
+    # Submit (uid, prompt) pairs as a single batch job and return the batch ID
+    def submit_batch(self, requests: List[Tuple[str, str]]):
+        client = self._batch_client()
+        body_parameters = self.model_id.model_parameters()
+        if 'max_tokens' in body_parameters: # Chat completions endpoint replaces max_tokens with max_completion_tokens
+            body_parameters['max_completion_tokens'] = body_parameters.pop('max_tokens')
+        batch_lines = []
+        for uid, prompt in requests:
+            body = {'model': self.model_id.value, 'messages': [{'role': 'user', 'content': prompt}], **body_parameters}
+            batch_lines.append(json.dumps({'custom_id': uid, 'method': 'POST', 'url': ModelClient._batch_endpoint, 'body': body}))
+        batch_file = client.files.create(file=('batch.jsonl', '\n'.join(batch_lines).encode('utf-8')), purpose='batch')
+        batch = client.batches.create(input_file_id=batch_file.id, endpoint=ModelClient._batch_endpoint, completion_window='24h')
+        return batch.id
+    
+    # Wait for batch job to finish and return predictions in the order of the given UIDs
+    def await_batch(self, batch_id: str, uids: List[str]):
+        client = self._batch_client()
+        batch = client.batches.retrieve(batch_id)
+        while batch.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(ModelClient._batch_poll_interval)
+            batch = client.batches.retrieve(batch_id)
+        if batch.status != 'completed' or not batch.output_file_id:
+            raise BatchFailedError(f'Batch {batch_id} did not complete (status: {batch.status}).')
+        responses = {}
+        for line in client.files.content(batch.output_file_id).text.splitlines():
+            record = json.loads(line)
+            response = record.get('response')
+            if response and response['status_code'] == 200:
+                responses[record['custom_id']] = response['body']['choices'][0]['message']['content']
+        missing_uids = [uid for uid in uids if uid not in responses]
+        if missing_uids:
+            raise BatchFailedError(f'Batch {batch_id} is missing successful responses for tasks: {missing_uids}')
+        return [{'uid': uid, 'prediction': responses[uid]} for uid in uids]
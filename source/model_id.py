@@ -87,10 +87,12 @@ class ModelID(Enum):
             case _:
                 raise NotImplementedError(f'Environment variable not implemented for host: {self.host}')
     
+    # API keys are read from the environment on each call (not cached), so updated keys are picked up by new clients
     def get_api_key(self):
-        api_key = os.getenv(self.env_variable())
+        env_variable = self.env_variable()
+        api_key = os.environ.get(env_variable)
         if not api_key:
-            raise ValueError(f'API key not found for environment variable: {self.env_variable()}')
+            raise ValueError(f'API key not found for environment variable: {env_variable}')
         return api_key
     
     def supports_temperature(self):
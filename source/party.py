@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 
 
-@dataclass
+# Parties are immutable, since sampled parties are shared across cases
+@dataclass(frozen=True, slots=True)
 class Party:
     first_name: str
     last_name: str
@@ -12,11 +13,13 @@ class Party:
     def full_name(self):
         return f'{self.first_name} {self.last_name}'
 
+    # Plural suffixes are at most two characters, so the name ending is checked directly
     def pluralize_last_name(self):
-        if self.last_name.endswith(('s', 'x', 'z', 'ch', 'sh')):
-            return self.last_name + 'es'
+        last_name = self.last_name
+        if last_name[-1:] in ('s', 'x', 'z') or last_name[-2:] in ('ch', 'sh'):
+            return last_name + 'es'
         else:
-            return self.last_name + 's'
+            return last_name + 's'
         
     def to_dict(self):
-        return vars(self)
+        return {'first_name': self.first_name, 'last_name': self.last_name}
@@ -0,0 +1,32 @@
+import sqlite3
+import hashlib
+from .model_id import ModelID
+
+
+# The prediction cache persists model predictions on disk, keyed by model and prompt.
+# Identical prompts (across reruns and datasets) are answered from the cache instead of the model provider.
+# Predictions are stored as raw response text.
+class PredictionCache:
+    _timeout = 30 # Seconds to wait on a locked database (e.g. suite datasets running in parallel)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection = sqlite3.connect(path, timeout=PredictionCache._timeout)
+        with self.connection:
+            self.connection.execute('CREATE TABLE IF NOT EXISTS predictions (key TEXT PRIMARY KEY, prediction TEXT NOT NULL)')
+
+    @staticmethod
+    def key(model_id: ModelID, prompt: str):
+        return hashlib.blake2b(f'{model_id.value}\0{prompt}'.encode('utf-8'), digest_size=16).hexdigest()
+
+    # Return cached prediction, or None if prediction is not cached
+    def get(self, key: str):
+        row = self.connection.execute('SELECT prediction FROM predictions WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, prediction: str):
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO predictions (key, prediction) VALUES (?, ?)', (key, prediction))
+
+    def close(self):
+        self.connection.close()
@@ -1,24 +1,37 @@
 import re
 from typing import Dict, List
-from pydantic import BaseModel, RootModel
+from pydantic import BaseModel, RootModel, PrivateAttr
+
+
+_SECTION_PATTERN = re.compile(r'§(?!\s)') # Section symbol not followed by whitespace
+
+
+# Citation normalization is shared by Claim and callers normalizing citation strings directly
+def normalize_citation(citation: str):
+    if '§' in citation: # Skip the pattern for citations without a section symbol
+        citation = _SECTION_PATTERN.sub('§ ', citation) # Ensure § is followed by a space
+    return citation.strip().lower()
 
 
 # Pydantic response classes are used to validate and parse task predictions into a structured format
 class Claim(BaseModel):
     citation: str
     claim_value: float
+    _normalized_citation: str = PrivateAttr() # Claims are matched by normalized citation many times, so it is computed once
+
+    def model_post_init(self, context):
+        self._normalized_citation = normalize_citation(self.citation)
 
     @staticmethod
     def normalize_citation(citation: str):
-        normalized = re.sub(r'§(?!\s)', '§ ', citation) # Ensure § is followed by a space
-        return normalized.strip().lower()
+        return normalize_citation(citation)
 
     def __str__(self):
         return f'Claim(citation: {self.citation}, value: {self.claim_value:,})'
     
     @property
     def normalized_citation(self):
-        return Claim.normalize_citation(self.citation)
+        return self._normalized_citation
 
 # TaskID.EXEMPTION_CLASSIFICATION
 class ExemptionClassificationResponse(RootModel):
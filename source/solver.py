@@ -1,6 +1,5 @@
-from dataclasses import dataclass
-from copy import deepcopy
-from typing import List, Dict, Tuple
+from dataclasses import dataclass, field
+from typing import List, Dict, Tuple, Any
 from .case import Case
 from .asset import Asset
 from .jurisdiction import Jurisdiction
@@ -8,26 +7,32 @@ from .statute import Exemption
 from .statute_set import StatuteSet
 
 
+_MISSING = object() # Journal value for map entries which did not exist before a change
+
+
 # The solution class represents the solution state for a given case, in a given jurisdiction.
+# Every change to the solution state is recorded in a journal, so changes can be rolled back to a snapshot (rather than copying the solution).
 @dataclass
 class Solution:
     exemptions: Dict[str, Exemption] # Citation to exemption map which is treated as an immutable copy of exemption values
     unclaimed_exemptions: Dict[str, float] # {citation: remaining balance}
-    claimed_exemptions: Dict[str, List[Dict[str, float]]] # {asset description: [{citation, claim value}]}
+    claimed_exemptions: Dict[str, Dict[str, float]] # {asset description: {citation: claim value}}
     non_exempt_assets: Dict[str, float] # {asset description: value}
     remaining_item_claim_counts: Dict[str, int] # {citation: remaining count}
     item_claim_amounts: Dict[str, float] # {citation: claim amount per item}
     remaining_fallback_relationships: Dict[str, Tuple[str, float]] # {to citation: (from citation, remaining balance)}
     excluded_exemptions: List[str] # List of exemption citations where a mutual exclusion relationship has been triggered
+    non_exempt_total: float = 0 # Running total of non-exempt asset values, maintained by set_non_exempt
+    journal: List[Tuple[Any, Any, Any]] = field(default_factory=list) # [(map, key, previous value)] or [(list, None, previous length)]
 
     def __lt__(self, other):
-        return self.total_non_exempt_value() < other.total_non_exempt_value()
+        return self.non_exempt_total < other.non_exempt_total
     
     def __ge__(self, other):
-        return self.total_non_exempt_value() >= other.total_non_exempt_value()
+        return self.non_exempt_total >= other.non_exempt_total
 
     def total_non_exempt_value(self):
-        return sum(self.non_exempt_assets.values())
+        return self.non_exempt_total
     
     # Attempt to allocate claim amount for the specified exemption and return the actual amount allocated.
     # Returned allocation amount represents min(claim amount, max remaining amount available under this exemption).
@@ -40,6 +45,7 @@ class Solution:
         if remaining_item_claim_count is not None:
             if remaining_item_claim_count < 1: # No more claims remaining
                 return 0
+            self._record(self.remaining_item_claim_counts, citation)
             self.remaining_item_claim_counts[citation] -= 1
             item_claim_amount = self.item_claim_amounts[citation]
         max_claim_amount = claim_amount if item_claim_amount is None else min(item_claim_amount, claim_amount)
@@ -53,19 +59,29 @@ class Solution:
                 remaining_claim_amount = min(balance, max_claim_amount - amount_claimed)
                 fallback_relationship_amount = self._process_claim(from_citation, remaining_claim_amount)
                 if fallback_relationship_amount > 0:
+                    self._record(self.remaining_fallback_relationships, citation)
                     self.remaining_fallback_relationships[citation] = (from_citation, balance - fallback_relationship_amount)
                     amount_claimed += fallback_relationship_amount
         return amount_claimed
 
+    # Claim amount allocate_claim_amount would return, without changing solution state (changes are rolled back)
+    def simulate_allocate(self, citation: str, claim_amount: float):
+        checkpoint = self.snapshot()
+        amount_claimed = self.allocate_claim_amount(citation, claim_amount)
+        self.rollback(checkpoint)
+        return amount_claimed
+
     # Internal method: should only be called by solution instance during claim allocation
     def _process_claim(self, citation: str, claim_amount: float):
         available_amount = self.unclaimed_exemptions[citation]
         if available_amount is None: # No exemption limit
             return claim_amount
         elif available_amount >= claim_amount:
+            self._record(self.unclaimed_exemptions, citation)
             self.unclaimed_exemptions[citation] -= claim_amount
             return claim_amount
         if available_amount > 0:
+            self._record(self.unclaimed_exemptions, citation)
             self.unclaimed_exemptions[citation] = 0
         return available_amount
 
@@ -74,17 +90,69 @@ class Solution:
         # Trigger mutual exclusion relationship if one exist
         exemption = self.exemptions[citation]
         if exemption.mutual_exclusion:
+            self._record_list(self.excluded_exemptions)
             self.excluded_exemptions.append(exemption.mutual_exclusion)
         if asset_description not in self.claimed_exemptions:
-            self.claimed_exemptions[asset_description] = []
-        citation_exists = False
-        for citation_dict in self.claimed_exemptions[asset_description]:
-            if citation_dict.get('citation') == citation:
-                citation_dict['claim_value'] += claim_amount
-                citation_exists = True
-                break
-        if not citation_exists:
-            self.claimed_exemptions[asset_description].append({'citation': citation, 'claim_value': claim_amount})
+            self._record(self.claimed_exemptions, asset_description)
+            self.claimed_exemptions[asset_description] = {}
+        asset_claims = self.claimed_exemptions[asset_description]
+        self._record(asset_claims, citation)
+        asset_claims[citation] = asset_claims.get(citation, 0) + claim_amount
+
+    # Claimed exemptions in solution format: {asset description: [{citation, claim value}]}
+    def formatted_claimed_exemptions(self):
+        return {asset_description: [{'citation': citation, 'claim_value': claim_value} for citation, claim_value in asset_claims.items()]
+                for asset_description, asset_claims in self.claimed_exemptions.items()}
+
+    # Mark asset as non-exempt with its remaining dollar value
+    # Non-exempt assets should only be set through this method, so the non-exempt total is kept up to date
+    def set_non_exempt(self, asset_description: str, dollar_value: float):
+        self._record(self.non_exempt_assets, asset_description)
+        self._record_attribute('non_exempt_total')
+        self.non_exempt_total += dollar_value - self.non_exempt_assets.get(asset_description, 0)
+        self.non_exempt_assets[asset_description] = dollar_value
+
+    # Record the current value of a map entry before it is changed
+    def _record(self, mapping: Dict, key: Any):
+        self.journal.append((mapping, key, mapping.get(key, _MISSING)))
+
+    # Record the current value of a solution attribute before it is changed
+    def _record_attribute(self, name: str):
+        self.journal.append((self, name, getattr(self, name)))
+
+    # Record the current length of a list before it is appended to
+    def _record_list(self, items: List):
+        self.journal.append((items, None, len(items)))
+
+    # Capture the current solution state, so that subsequent changes may be rolled back.
+    def snapshot(self):
+        return len(self.journal)
+    
+    # Revert solution state to a snapshot created by the snapshot method (changes are undone in reverse order)
+    def rollback(self, snapshot: int):
+        journal = self.journal
+        while len(journal) > snapshot:
+            container, key, value = journal.pop()
+            if container is self:
+                setattr(self, key, value)
+            elif key is None and isinstance(container, list):
+                del container[value:]
+            elif value is _MISSING:
+                del container[key]
+            else:
+                container[key] = value
+
+    # Copy of the current solution state (with an empty journal), immutable exemption values are shared
+    def clone(self):
+        return Solution(self.exemptions,
+                        dict(self.unclaimed_exemptions),
+                        {asset_description: dict(asset_claims) for asset_description, asset_claims in self.claimed_exemptions.items()},
+                        dict(self.non_exempt_assets),
+                        dict(self.remaining_item_claim_counts),
+                        self.item_claim_amounts,
+                        dict(self.remaining_fallback_relationships),
+                        list(self.excluded_exemptions),
+                        self.non_exempt_total)
 
     # Check if a given exemption has item claims still available
     def item_claim_exists(self, citation: str):
@@ -106,7 +174,10 @@ class Solver:
         self.married_item_claim_amount_map = {}
         self.single_fallback_relationship_map = {}
         self.married_fallback_relationship_map = {}
+        self.citation_map = {} # {jurisdiction: exemption citations}
+        self.citation_union_map = {} # {jurisdictions: exemption citations}, filled on demand by citations_for_jurisdictions
         for jurisdiction, statute_set in statute_set_map.items():
+            self.citation_map[jurisdiction] = frozenset(statute_set.exemption_citations())
             self.exemption_map[jurisdiction] = {}
             self.single_exemption_map[jurisdiction] = {}
             self.married_exemption_map[jurisdiction] = {}
@@ -126,76 +197,93 @@ class Solver:
                 self.married_item_claim_amount_map[jurisdiction][exemption.citation] = exemption.married_limit / exemption.married_item_claim_count if exemption.married_item_claim_count else None
                 self.single_fallback_relationship_map[jurisdiction][exemption.citation] = (exemption.fallback_relationship, exemption.single_fallback_limit)
                 self.married_fallback_relationship_map[jurisdiction][exemption.citation] = (exemption.fallback_relationship, exemption.married_fallback_limit)
+        # Initial solution state for each jurisdiction and marital status, solutions are initialized as clones of these templates
+        self.solution_template_map = {}
+        for jurisdiction in statute_set_map:
+            self.solution_template_map[(jurisdiction, False)] = Solution(self.exemption_map[jurisdiction], 
+                                                                         self.single_exemption_map[jurisdiction], {}, {}, 
+                                                                         self.single_item_claim_count_map[jurisdiction], 
+                                                                         self.single_item_claim_amount_map[jurisdiction], 
+                                                                         self.single_fallback_relationship_map[jurisdiction], [])
+            self.solution_template_map[(jurisdiction, True)] = Solution(self.exemption_map[jurisdiction], 
+                                                                        self.married_exemption_map[jurisdiction], {}, {}, 
+                                                                        self.married_item_claim_count_map[jurisdiction], 
+                                                                        self.married_item_claim_amount_map[jurisdiction], 
+                                                                        self.married_fallback_relationship_map[jurisdiction], [])
 
+    # Set of exemption citations across jurisdictions (memoized, since the same jurisdiction combinations recur across cases)
     def citations_for_jurisdictions(self, jurisdictions: List[Jurisdiction]):
-        citations = []
-        for jurisdiction in jurisdictions:
-            statute_set = self.statute_set_map[jurisdiction]
-            citations.extend(statute_set.exemption_citations())
-        return citations
+        key = frozenset(jurisdictions)
+        if key not in self.citation_union_map:
+            self.citation_union_map[key] = frozenset().union(*(self.citation_map[jurisdiction] for jurisdiction in key))
+        return self.citation_union_map[key]
     
     def init_solution(self, case: Case, jurisdiction: Jurisdiction):
-        exemptions = self.exemption_map[jurisdiction]
-        unclaimed_exemptions = self.married_exemption_map[jurisdiction] if case.has_married_couple() else self.single_exemption_map[jurisdiction]
-        remaining_item_claim_counts = self.married_item_claim_count_map[jurisdiction] if case.has_married_couple() else self.single_item_claim_count_map[jurisdiction]
-        item_claim_amounts = self.married_item_claim_amount_map[jurisdiction] if case.has_married_couple() else self.single_item_claim_amount_map[jurisdiction]
-        remaining_fallback_relationships = self.married_fallback_relationship_map[jurisdiction] if case.has_married_couple() else self.single_fallback_relationship_map[jurisdiction]
-        return deepcopy(Solution(exemptions, unclaimed_exemptions, {}, {}, remaining_item_claim_counts, item_claim_amounts, remaining_fallback_relationships, []))
+        return self.solution_template_map[(jurisdiction, case.has_married_couple())].clone()
     
     def solve_case_for_jurisdiction(self, case: Case, jurisdiction: Jurisdiction):
         solution = self.init_solution(case, jurisdiction)
-        assets = deepcopy(case.assets)
+        # Search assets are constructed fresh (rather than deep copying case assets), since only applicable exemptions differ
         jurisdiction_citations = self.citations_for_jurisdictions([jurisdiction])
-        for asset in assets:
-            asset.applicable_exemptions = [citation for citation in asset.applicable_exemptions if citation in jurisdiction_citations]
+        assets = [Asset(asset.description, 
+                        asset.dollar_value, 
+                        [citation for citation in asset.applicable_exemptions if citation in jurisdiction_citations], 
+                        asset.category_hints) 
+                  for asset in case.assets]
         # Sort assets such that those with fewer applicable exemptions are exempted first.
         assets = sorted(assets, key=lambda asset: len(asset.applicable_exemptions))
-        return self.recursive_optimal_exemption_search(assets, solution)
+        return self.recursive_optimal_exemption_search(assets, 0, solution)
 
     # Branch and bound algorithm for determining optimal exemptions
-    def recursive_optimal_exemption_search(self, assets: List[Asset], solution: Solution, optimal: Solution = None):
-        if not assets:
-            return solution if optimal is None else min(solution, optimal)
-        asset = assets[0]
+    # Solution and asset state is changed in place while exploring a branch, then rolled back before exploring the next branch
+    # Assets before the index have been processed (assets are traversed by index, rather than slicing the remaining assets)
+    def recursive_optimal_exemption_search(self, assets: List[Asset], index: int, solution: Solution, optimal: Solution = None):
+        # Remaining assets can only add non-exempt value, so a solution already worse than the optimal solution cannot improve on it
+        # Pruning is strict, since a solution tied with the optimal solution may still replace it
+        if optimal is not None and solution.non_exempt_total > optimal.non_exempt_total:
+            return optimal
+        if index == len(assets):
+            # Current solution replaces optimal solution unless optimal is strictly better (solution is copied, since its state will be rolled back)
+            return optimal if optimal is not None and optimal.non_exempt_total < solution.non_exempt_total else solution.clone()
+        asset = assets[index]
         if not asset.applicable_exemptions: # No applicable exemptions remain
-            new_solution = deepcopy(solution)
-            new_solution.non_exempt_assets[asset.description] = asset.dollar_value
+            checkpoint = solution.snapshot()
+            solution.set_non_exempt(asset.description, asset.dollar_value)
             # If current solution already has a greater total value of non-exempt assets, prune this branch
-            if optimal and (new_solution >= optimal):
-                return optimal
-            return self.recursive_optimal_exemption_search(assets[1:], new_solution, optimal)
+            if optimal is not None and solution.non_exempt_total >= optimal.non_exempt_total:
+                new_optimal = optimal
+            else:
+                new_optimal = self.recursive_optimal_exemption_search(assets, index + 1, solution, optimal)
+            solution.rollback(checkpoint)
+            return new_optimal
         
         # Check every permutation of exemption application, including claiming no exemptions for the current asset
+        # Searches return a solution no worse than the optimal solution passed in, so the result becomes the new optimal solution
         new_optimal = optimal
-        for citation in asset.applicable_exemptions:
-            new_solution = deepcopy(solution)
-            allocated_amount = new_solution.allocate_claim_amount(citation, asset.dollar_value)
+        applicable_exemptions = asset.applicable_exemptions
+        dollar_value = asset.dollar_value
+        for citation in applicable_exemptions:
+            checkpoint = solution.snapshot()
+            allocated_amount = solution.allocate_claim_amount(citation, dollar_value)
             if allocated_amount > 0:
-                new_solution.claim_exemption(citation, asset.description, allocated_amount)
-            if allocated_amount == asset.dollar_value: # Asset is completely exempt
-                new_solution = self.recursive_optimal_exemption_search(assets[1:], new_solution, new_optimal)
+                solution.claim_exemption(citation, asset.description, allocated_amount)
+            if allocated_amount == dollar_value: # Asset is completely exempt
+                new_optimal = self.recursive_optimal_exemption_search(assets, index + 1, solution, new_optimal)
             else: # Asset is not completely protected under current exemption
-                updated_assets = assets[:]
-                updated_assets[0] = deepcopy(assets[0])
-                updated_asset = updated_assets[0]
-                updated_asset.dollar_value -= allocated_amount
-                if new_solution.item_claim_exists(citation):
-                    # We've just used an item claim, but additional item claims still exist for this exemption.
-                    # Leave the citation in the applicable exemptions, so we may check the solution where additional item claims are used on this asset.
-                    new_solution = self.recursive_optimal_exemption_search(updated_assets, new_solution, new_optimal)
-                else:
-                    updated_exemptions = [exemption for exemption in updated_asset.applicable_exemptions if exemption != citation]
-                    updated_asset.applicable_exemptions = updated_exemptions
-                    new_solution = self.recursive_optimal_exemption_search(updated_assets, new_solution, new_optimal)
-            new_optimal = new_solution if new_optimal is None else min(new_solution, new_optimal)
+                asset.dollar_value = dollar_value - allocated_amount
+                # If we've just used an item claim, but additional item claims still exist for this exemption,
+                # leave the citation in the applicable exemptions, so we may check the solution where additional item claims are used on this asset.
+                if not solution.item_claim_exists(citation):
+                    asset.applicable_exemptions = [exemption for exemption in applicable_exemptions if exemption != citation]
+                new_optimal = self.recursive_optimal_exemption_search(assets, index, solution, new_optimal)
+                asset.dollar_value = dollar_value
+                asset.applicable_exemptions = applicable_exemptions
+            solution.rollback(checkpoint)
 
         # Check solution where we claim no exemptions for this asset
-        updated_assets = assets[:]
-        updated_assets[0] = deepcopy(assets[0])
-        updated_assets[0].applicable_exemptions = []
-        new_solution = deepcopy(solution)
-        new_solution = self.recursive_optimal_exemption_search(updated_assets, new_solution, new_optimal)
-        new_optimal = new_solution if new_optimal is None else min(new_solution, new_optimal)
+        asset.applicable_exemptions = []
+        new_optimal = self.recursive_optimal_exemption_search(assets, index, solution, new_optimal)
+        asset.applicable_exemptions = applicable_exemptions
         return new_optimal
     
     # Solve TaskID.EXEMPTION_CLASSIFICATION
@@ -212,12 +300,11 @@ class Solver:
         for jurisdiction in allowable_jurisdictions:
             # This object represents the solution state prior to exempting any assets. We will use it to calculate solutions at the asset level (without considering aggregate values).
             unprocessed_solution = self.init_solution(case, jurisdiction)
-            allowable_exemptions = self.statute_set_map[jurisdiction].exemption_citations()
+            allowable_exemptions = self.citation_map[jurisdiction]
             for asset in case.assets:
                 filtered_exemptions = list(filter(lambda exemption: exemption in allowable_exemptions, asset.applicable_exemptions))
                 for citation in filtered_exemptions:
-                    solution_copy = deepcopy(unprocessed_solution)
-                    claim_amount = solution_copy.allocate_claim_amount(citation, asset.dollar_value)
+                    claim_amount = unprocessed_solution.simulate_allocate(citation, asset.dollar_value)
                     if claim_amount > 0:
                         if asset.description not in solution:
                             solution[asset.description] = []
@@ -235,5 +322,5 @@ class Solver:
     # Solve TaskID.OPTIMAL_EXEMPTIONS
     def solve_optimal_exemptions(self, case: Case, allowable_jurisdictions: List[Jurisdiction]):
         solutions = [self.solve_case_for_jurisdiction(case, jurisdiction) for jurisdiction in allowable_jurisdictions]
-        solution = min(solutions)
-        return solution.claimed_exemptions
\ No newline at end of file
+        solution = min(solutions, key=lambda solution: solution.non_exempt_total)
+        return solution.formatted_claimed_exemptions()
\ No newline at end of file
@@ -1,6 +1,7 @@
 import os
 import json
-from typing import Dict, List, Any
+from functools import lru_cache
+from typing import Dict, List, Tuple, Any
 from .jurisdiction import Jurisdiction
 from .statute import Statute, Exemption
 from .statute_set import StatuteSet
@@ -39,8 +40,14 @@ class StatuteFactory:
                           statute_set_dict['has_opted_out'], 
                           statutes)
     
+    # Statute sets are read-only once loaded, so loaded sets are cached and shared by all callers in the process
     @staticmethod
     def load_statute_sets(directory: str, jurisdictions: List[Jurisdiction]):
+        return list(StatuteFactory._load_statute_sets(directory, tuple(jurisdictions) if jurisdictions else ()))
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _load_statute_sets(directory: str, jurisdictions: Tuple[Jurisdiction, ...]):
         statute_sets = []
         if jurisdictions:
             file_names = map(lambda jurisdiction: jurisdiction.file_name(), jurisdictions)
@@ -49,4 +56,4 @@ class StatuteFactory:
         for file_name in file_names:
             path = os.path.join(directory, file_name)
             statute_sets.append(StatuteFactory.load_statute_set(path))
-        return statute_sets
\ No newline at end of file
+        return tuple(statute_sets)
@@ -174,8 +174,7 @@ class TaskDataset:
     def save_to_path(self, path: str, case_file_path: str = None, shared_file_path: str = None, split: str = 'test'):
         self.logger.info(f'Begin saving {split} dataset: {self.name} to path: {path}')
         assert len(self._tasks[split]) > 0, f'Attempting to save empty {split} dataset: {self.name}'
-        serialized_tasks = list(map(lambda task: task.dynamic_components(), self._tasks[split]))
-        write_jsonl_file(path, serialized_tasks)
+        write_jsonl_file(path, (task.dynamic_components() for task in self._tasks[split])) # Tasks are serialized as they are written
         if shared_file_path:
             with open(shared_file_path, 'w') as file:
                 json.dump(self._tasks[split][0].shared_components(), file, indent=4)
@@ -183,8 +182,7 @@ class TaskDataset:
             assert len(self._cases[split]) == len(self._tasks[split]), (
                 f"Failed to save {split} dataset: {self.name} due to task count {len(self._tasks[split])} not being equal to case count {len(self._cases[split])}."
                 )
-            serialized_cases = list(map(lambda case: case.serialize(), self._cases[split]))
-            write_jsonl_file(case_file_path, serialized_cases)
+            write_jsonl_file(case_file_path, (case.serialize() for case in self._cases[split]))
         self.logger.info(f'Finished saving {split} dataset.')
 
     def _load_data(self, split: str = 'test'):
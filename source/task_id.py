@@ -1,4 +1,5 @@
 from enum import Enum, unique
+from functools import cache
 from langchain_core.output_parsers import PydanticOutputParser
 from .pydantic_response import (
     ExemptionClassificationResponse, 
@@ -16,13 +17,18 @@ class TaskID(Enum):
     NONEXEMPT_ASSETS = 4
     OPTIMAL_EXEMPTIONS = 5
 
+    # Task display names are static, so they are computed once and shared by all callers
     @staticmethod
+    @cache
     def supported_tasks():
-        return [member.display_name() for member in TaskID]
+        return tuple(member.display_name() for member in TaskID)
     
     @staticmethod
     def display_name_to_task_id(display_name: str):
-        return TaskID[display_name.replace(' ', '_').upper()]
+        task_id = _DISPLAY_NAME_TO_TASK_ID.get(display_name)
+        if task_id is None: # Fall back to name normalization for non-canonical display names
+            task_id = TaskID[display_name.replace(' ', '_').upper()]
+        return task_id
     
     def display_name(self):
         words = self.name.split('_')
@@ -37,7 +43,7 @@ class TaskID(Enum):
             case _:
                 raise NotImplementedError(f'Response type not implemented for task: {self}.')
     
-    def response_parser(self):
+    def response_class(self):
         response_class_registry = {
             TaskID.EXEMPTION_CLASSIFICATION: ExemptionClassificationResponse,
             TaskID.EXEMPTION_VALUATION: ExemptionValuationResponse,
@@ -48,6 +54,15 @@ class TaskID(Enum):
             return None
         response_class = response_class_registry[self] if self in response_class_registry else None
         if response_class:
-            return PydanticOutputParser(pydantic_object=response_class)
+            return response_class
         else:
-            raise NotImplementedError(f'Response parser not implemented for task: {self}.')
\ No newline at end of file
+            raise NotImplementedError(f'Response class not implemented for task: {self}.')
+    
+    def response_parser(self):
+        response_class = self.response_class()
+        if response_class is None:
+            return None
+        return PydanticOutputParser(pydantic_object=response_class)
+
+# Canonical display name lookup, built once since task IDs are static
+_DISPLAY_NAME_TO_TASK_ID = {member.display_name(): member for member in TaskID}
\ No newline at end of file
@@ -1,8 +1,11 @@
 import os
-import json
+import stat
+import uuid
 import random
-from collections.abc import Sequence, Generator
-from typing import List, Dict, Any
+import orjson
+from contextlib import contextmanager
+from collections.abc import Sequence, Generator, Iterable
+from typing import Dict, Any
 
 
 RANDOM_SEED = None
@@ -15,15 +18,48 @@ def set_random_seed(seed: int):
 def get_random_seed():
     return RANDOM_SEED
 
+# JSONL files are (de)serialized with orjson, which reads and writes UTF-8 bytes directly
+# Files are read in a single call and split into lines, rather than iterating the file line by line
 def read_jsonl_file(path: str):
-    with open(path, 'r') as file:
-        return [json.loads(line) for line in file]
+    with open(path, 'rb') as file:
+        data = file.read()
+    return [orjson.loads(line) for line in data.split(b'\n') if line.strip()]
     
-def write_jsonl_file(path: str, items: List[Dict]):
-    with open(path, 'w') as file:
+def write_jsonl_file(path: str, items: Iterable[Dict]): # Items may be a generator, so records are serialized as they are written
+    with atomic_write(path) as file:
         for item in items:
-            line = json.dumps(item)
-            file.write(line + '\n')
+            file.write(orjson.dumps(item, option=orjson.OPT_APPEND_NEWLINE))
+
+def write_json_file(path: str, item: Dict):
+    with atomic_write(path) as file:
+        file.write(orjson.dumps(item, option=orjson.OPT_INDENT_2))
+
+# Writes to a temporary file in the destination directory, then renames it over the destination path
+# An interrupted write leaves no file at the destination, rather than a truncated file that appears complete
+# The temporary file is created with mode 0666 (masked by the umask, like open), and is given the destination's mode if it already exists
+@contextmanager
+def atomic_write(path: str):
+    temp_path = os.path.join(os.path.dirname(path) or '.', f'{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.tmp')
+    file = os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666), 'wb')
+    try:
+        with file:
+            yield file
+            file.flush()
+            os.fsync(file.fileno())
+        file_mode = _file_mode(path)
+        if file_mode is not None:
+            os.chmod(temp_path, file_mode)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+# Mode of an existing file, or None if the file does not exist
+def _file_mode(path: str):
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        return None
 
 def file_names_with_extension(directory: str, extension: str):
     directory_contents = os.listdir(directory)
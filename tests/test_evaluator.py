@@ -0,0 +1,124 @@
+import os
+import json
+import logging
+import unittest
+from source.case import Case
+from source.jurisdiction import Jurisdiction
+from source.statute_factory import StatuteFactory
+from source.task_id import TaskID
+from evaluator import Evaluator
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'solver_cases.json')
+
+
+class EvaluatorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.statute_sets = StatuteFactory.load_statute_sets('data/statutes', list(Jurisdiction))
+        cls.evaluator = Evaluator(cls.statute_sets)
+        cls.logger = logging.getLogger('evaluator_test')
+        cls.logger.disabled = True
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as file:
+            cls.records = json.load(file)
+
+    # Predictions are given as model output strings (dicts are serialized to JSON), cases are only used by TaskID.OPTIMAL_EXEMPTIONS
+    def evaluate(self, task_id: TaskID, predictions: list, targets: list, cases: list = None, evaluator: Evaluator = None):
+        predictions = [{'uid': str(index), 'prediction': prediction if isinstance(prediction, str) else json.dumps(prediction)}
+                       for index, prediction in enumerate(predictions)]
+        targets = [{'uid': str(index), 'target': target} for index, target in enumerate(targets)]
+        cases = cases or [None] * len(targets)
+        return (evaluator or self.evaluator).evaluate(task_id, predictions, targets, cases, self.logger)
+
+    def assertScores(self, results: dict, expected: dict):
+        self.assertEqual(results.keys(), expected.keys())
+        for key, value in expected.items():
+            if isinstance(value, float):
+                self.assertAlmostEqual(results[key], value, places=12, msg=key)
+            else:
+                self.assertEqual(results[key], value, msg=key)
+
+    def test_allowable_exemptions(self):
+        results = self.evaluate(TaskID.ALLOWABLE_EXEMPTIONS,
+                                ['Federal, Arizona', '', 'Oregon'],
+                                ['Arizona', 'Federal', ''])
+        # Sample scores: (1/2, 1, 2/3), then zero denominators (no predictions, no targets) score 0
+        self.assertScores(results, {'precision': 1 / 6, 'recall': 1 / 3, 'f1': 2 / 9})
+
+    def test_exemption_classification(self):
+        results = self.evaluate(TaskID.EXEMPTION_CLASSIFICATION,
+                                [{'silver necklice': ['11 U.S.C. §522(d)(4)', 'Ariz. Rev. Stat. § 33-1126(A)(1)'],
+                                  'gold patch': ['11 U.S.C. § 522(d)(5)']},
+                                 'not a valid response',
+                                 {'sedan': ['11 U.S.C. § 522(d)(2)']}],
+                                [{'Silver Necklace': ['11 U.S.C. § 522(d)(4)', '11 U.S.C. § 522(d)(5)'],
+                                  'Gold Watch': ['11 U.S.C. § 522(d)(5)']},
+                                 {'Sedan': ['11 U.S.C. § 522(d)(2)']},
+                                 {'Sedan': ['11 U.S.C. § 522(d)(2)']}])
+        # Sample 1: necklace matches (partial ratio 93), watch does not (partial ratio 90 is not above the threshold)
+        # Sample scores: (1/4, 1/4, 1/4), invalid format (0, 0, 0), exact match (1, 1, 1)
+        self.assertScores(results, {'precision': 5 / 12, 'recall': 5 / 12, 'f1': 5 / 12, 'invalid_format': 1})
+
+    def test_asset_description_matching_threshold(self):
+        matches = self.evaluator._match_asset_descriptions(['silver necklace', 'gold watch', 'sedan'], ['silver necklice', 'gold patch', 'sedan'])
+        self.assertEqual(matches, ['silver necklice', None, 'sedan'])
+        self.assertEqual(self.evaluator._match_asset_descriptions(['sedan'], []), [None])
+
+    def test_exemption_valuation(self):
+        results = self.evaluate(TaskID.EXEMPTION_VALUATION,
+                                [{'Violin': [{'citation': '11 U.S.C. § 522(d)(3)', 'claim_value': 1000},
+                                             {'citation': '11 U.S.C. § 522(d)(5)', 'claim_value': 700},
+                                             {'citation': '11 U.S.C. § 522(d)(1)', 'claim_value': 10}],
+                                  'Bicycle': []},
+                                 'not a valid response'],
+                                [{'Violin': [{'citation': '11 U.S.C. § 522(d)(3)', 'claim_value': 1000},
+                                             {'citation': '11 U.S.C. § 522(d)(5)', 'claim_value': 500}],
+                                  'Bicycle': []},
+                                 {'Violin': [{'citation': '11 U.S.C. § 522(d)(3)', 'claim_value': 1000}]}])
+        # Violin: one exact claim, one claim outside tolerance and one unknown claim (precision 1/3, recall 1/2, f1 2/5)
+        # Bicycle has no claims on either side, so zero denominators score 0 and it has no MARE
+        violin_mare = (0 + abs(700 / 501 - 1)) / 2
+        self.assertScores(results, {'precision': 1 / 12, 'recall': 1 / 8, 'f1': 1 / 10, 'mare': violin_mare, 'invalid_format': 1})
+
+    def test_nonexempt_assets(self):
+        results = self.evaluate(TaskID.NONEXEMPT_ASSETS,
+                                [{'federal': 1000, 'arizona': 0.5, 'oregon': 5}, {}],
+                                [{'Federal': 1000.0, 'Arizona': 0.0}, {'Federal': 10.0}])
+        # Sample 1: Federal is exact, Arizona is outside tolerance (error 0.5), Oregon is not in the target (no error)
+        # Sample 2 has no predictions, so precision has a zero denominator and MARE is undefined
+        self.assertScores(results, {'precision': 1 / 6, 'recall': 1 / 4, 'f1': 1 / 5, 'mare': 0.25, 'invalid_format': 0})
+
+    def test_nonexempt_assets_without_matches(self):
+        results = self.evaluate(TaskID.NONEXEMPT_ASSETS, [{}], [{'Federal': 10.0}])
+        self.assertScores(results, {'precision': 0.0, 'recall': 0.0, 'f1': 0.0, 'mare': None, 'invalid_format': 0})
+
+    def test_optimal_exemptions(self):
+        cases = [Case.create_case(**record['case']) for record in self.records]
+        targets = [record['solutions'][TaskID.OPTIMAL_EXEMPTIONS.name] for record in self.records]
+        results = self.evaluate(TaskID.OPTIMAL_EXEMPTIONS, targets, targets, cases)
+        self.assertScores(results, {'precision': 1.0, 'recall': 1.0, 'f1': 1.0, 'mare': 0.0, 'invalid_claim_ratio': 0.0, 'invalid_format': 0})
+        results = self.evaluate(TaskID.OPTIMAL_EXEMPTIONS, ['not a valid response', {}], targets[:2], cases[:2])
+        self.assertScores(results, {'precision': 0.0, 'recall': 0.0, 'f1': 0.0, 'mare': None, 'invalid_claim_ratio': 1.0, 'invalid_format': 1})
+
+    # Scores from worker processes must be identical to serial scores
+    def test_worker_results_match_serial_results(self):
+        parallel_evaluator = Evaluator(self.statute_sets, max_workers=2)
+        cases = [Case.create_case(**record['case']) for record in self.records]
+        for task_id in (TaskID.EXEMPTION_VALUATION, TaskID.OPTIMAL_EXEMPTIONS):
+            targets = [record['solutions'][task_id.name] for record in self.records]
+            predictions = []
+            for index, target in enumerate(targets):
+                if index % 4 == 3:
+                    predictions.append('not a valid response')
+                    continue
+                scale = (1, 0.9, 0.5)[index % 4]
+                predictions.append({asset_description: [{'citation': claim['citation'], 'claim_value': claim['claim_value'] * scale} for claim in claims]
+                                    for asset_description, claims in target.items()})
+            with self.subTest(task_id=task_id.name):
+                serial_results = self.evaluate(task_id, predictions, targets, cases)
+                parallel_results = self.evaluate(task_id, predictions, targets, cases, parallel_evaluator)
+                self.assertEqual(parallel_results, serial_results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+from open_exempt import generate_demo
+from source.asset_factory import AssetFactory
+from source.case import Case
+from source.config import Config
+from source.utils import set_random_seed
+
+
+class GenerateDemoTest(unittest.TestCase):
+    def test_generate_demo(self):
+        set_random_seed(7)
+        case, task = generate_demo(Config.from_default('demo', verbose=False))
+        self.assertIsInstance(case, Case)
+        self.assertTrue(case.assets)
+        self.assertTrue(task.to_target())
+
+    def test_generate_demo_with_shared_assets(self):
+        config = Config.from_default('demo', verbose=False)
+        assets = AssetFactory.load_assets(config.asset_directory)
+        set_random_seed(7)
+        case, _ = generate_demo(config, assets)
+        asset_descriptions = {asset.description for asset in assets}
+        self.assertTrue(all(asset.description in asset_descriptions for asset in case.assets))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import os
+import json
+import unittest
+from source.case import Case
+from source.config import Config
+from source.task_generator import TaskGenerator
+from source.task_id import TaskID
+
+
+# Solutions in the fixture were produced by the original deepcopy-based branch and bound solver,
+# for seeded cases with 2-8 assets across every state jurisdiction (single and married debtors)
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'solver_cases.json')
+
+
+class SolverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(FIXTURE_PATH, 'r', encoding='utf-8') as file:
+            cls.records = json.load(file)
+        cls.task_generator = TaskGenerator(Config.from_default('solver_test', verbose=False))
+
+    def solve(self, case: Case, task_id: TaskID):
+        allowable_jurisdictions = self.task_generator.statute_set_map[case.state_jurisdiction].allowable_exemption_jurisdictions()
+        return self.task_generator.solve_case(case, task_id, allowable_jurisdictions)
+
+    def test_solutions_match_fixture(self):
+        for index, record in enumerate(self.records):
+            case = Case.create_case(**record['case'])
+            for task_id in TaskID:
+                with self.subTest(case=index, task_id=task_id.name):
+                    self.assertEqual(self.solve(case, task_id), record['solutions'][task_id.name])
+
+    # Solutions are initialized from shared templates and rolled back in place, so solving must not leak state across cases
+    def test_solutions_do_not_depend_on_solve_order(self):
+        for index, record in reversed(list(enumerate(self.records))):
+            case = Case.create_case(**record['case'])
+            with self.subTest(case=index):
+                self.assertEqual(self.solve(case, TaskID.OPTIMAL_EXEMPTIONS), record['solutions'][TaskID.OPTIMAL_EXEMPTIONS.name])
+                self.assertEqual(self.solve(case, TaskID.OPTIMAL_EXEMPTIONS), record['solutions'][TaskID.OPTIMAL_EXEMPTIONS.name])
+
+    def test_solving_does_not_modify_case_assets(self):
+        record = max(self.records, key=lambda record: len(record['case']['assets']))
+        case = Case.create_case(**record['case'])
+        assets_before = [asset.to_dict() for asset in case.assets]
+        for task_id in TaskID:
+            self.solve(case, task_id)
+        self.assertEqual([asset.to_dict() for asset in case.assets], assets_before)
+
+
+if __name__ == '__main__':
+    unittest.main()